@@ -0,0 +1,68 @@
+import re
+import unicodedata
+from config import settings
+from cache import TTLCache
+import metrics
+
+# =====================================================
+# 🔹 Answer cache for FAQ-style LLM endpoints
+# =====================================================
+# Answers are cached per endpoint namespace ("ask", "chat") under the
+# normalized question, so "What is Machine Learning?" and
+# "what is machine learning" share one entry. Only successful answers
+# are stored.
+
+ANSWER_CACHE_TTL = settings.answer_cache_ttl
+ANSWER_CACHE_SIZE = settings.answer_cache_size
+
+_PUNCTUATION = re.compile(r"[^\w\s+#]")
+_caches = {}
+
+
+def normalize_query(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a question."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+def _cache(namespace: str) -> TTLCache:
+    if namespace not in _caches:
+        _caches[namespace] = TTLCache(maxsize=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL)
+        metrics.register_cache(f"answers_{namespace}", _caches[namespace])
+    return _caches[namespace]
+
+
+def get_answer(namespace: str, query: str):
+    key = normalize_query(query)
+    return _cache(namespace).get(key) if key else None
+
+
+def store_answer(namespace: str, query: str, answer: str):
+    key = normalize_query(query)
+    if key and answer:
+        _cache(namespace).set(key, answer)
+
+
+async def cached_stream(namespace: str, query: str, tokens):
+    """
+    Wrap a token generator: replay a cached answer in one chunk, or pass
+    tokens through and cache the full answer once the stream completes.
+    """
+    cached = get_answer(namespace, query)
+    if cached is not None:
+        await tokens.aclose()
+        yield cached
+        return
+
+    parts = []
+    try:
+        async for token in tokens:
+            parts.append(token)
+            yield token
+    finally:
+        await tokens.aclose()
+    store_answer(namespace, query, "".join(parts).strip())
+
+
+def get_stats() -> dict:
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
@@ -0,0 +1,101 @@
+import re
+from skill_extractor import extract_skills_locally
+
+# =====================================================
+# 🔹 Local ATS pre-scorer
+# =====================================================
+# Deterministic 0-100 score in a few milliseconds, no LLM involved:
+#   - keyword coverage of the job description (50 pts)
+#   - presence of the standard resume sections (25 pts)
+#   - formatting signals ATS parsers and recruiters look for (25 pts)
+# Keywords are the canonical skills from the shared taxonomy that the
+# job description mentions, so posting filler ("hiring", "ideal", ...)
+# never counts as missing. Without a job description, or when it names
+# no known skills, the section and formatting parts are scaled up to
+# cover the full 100.
+KEYWORD_WEIGHT = 50
+SECTION_WEIGHT = 25
+FORMAT_WEIGHT = 25
+MAX_JD_TERMS = 25
+
+SECTION_PATTERNS = {
+    "summary": r"\b(summary|objective|profile|about me)\b",
+    "skills": r"\b(skills|technical skills|technologies|tech stack)\b",
+    "experience": r"\b(experience|employment|work history|internships?)\b",
+    "education": r"\b(education|academics?|qualifications?)\b",
+    "projects": r"\bprojects?\b",
+    "certifications": r"\b(certifications?|certificates?|courses)\b",
+}
+_SECTIONS = {name: re.compile(p, re.IGNORECASE) for name, p in SECTION_PATTERNS.items()}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+_BULLET = re.compile(r"^\s*[-•*▪●◦]", re.MULTILINE)
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\s*(%|\+|x\b|k\b|lakh|crore|users|clients)?", re.IGNORECASE)
+_WORD = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+
+ACTION_VERBS = {
+    "built", "developed", "designed", "implemented", "led", "created", "improved",
+    "optimized", "managed", "delivered", "automated", "analyzed", "deployed",
+    "launched", "reduced", "increased", "collaborated", "engineered", "trained",
+}
+
+
+def job_keywords(job_description: str) -> list:
+    """Canonical skills mentioned in the JD, most mentioned first."""
+    skills, _ = extract_skills_locally(job_description)
+    return skills[:MAX_JD_TERMS]
+
+
+def _keyword_coverage(resume_text: str, keywords: list):
+    resume_skills, _ = extract_skills_locally(resume_text)
+    have = {s.lower() for s in resume_skills}
+    found = [k for k in keywords if k.lower() in have]
+    missing = [k for k in keywords if k.lower() not in have]
+    return len(found) / len(keywords) if keywords else 0.0, found, missing
+
+
+def _formatting(resume_text: str) -> dict:
+    words = _WORD.findall(resume_text.lower())
+    word_count = len(words)
+    return {
+        "word_count": word_count,
+        "good_length": 300 <= word_count <= 1000,
+        "has_email": bool(_EMAIL.search(resume_text)),
+        "has_phone": bool(_PHONE.search(resume_text)),
+        "uses_bullets": len(_BULLET.findall(resume_text)) >= 3,
+        "quantified_achievements": len(_NUMBER.findall(resume_text)) >= 3,
+        "action_verbs": len(ACTION_VERBS.intersection(words)) >= 3,
+    }
+
+
+def score_resume(resume_text: str, job_description: str = "") -> dict:
+    """Return the local ATS score with its breakdown and missing keywords."""
+    sections = {name: bool(p.search(resume_text)) for name, p in _SECTIONS.items()}
+    formatting = _formatting(resume_text)
+
+    section_ratio = sum(sections.values()) / len(sections)
+    format_checks = [v for v in formatting.values() if isinstance(v, bool)]
+    format_ratio = sum(format_checks) / len(format_checks)
+
+    result = {"mode": "fast", "sections": sections, "formatting": formatting}
+    keywords = job_keywords(job_description) if job_description.strip() else []
+    if keywords:
+        coverage, found, missing = _keyword_coverage(resume_text, keywords)
+        score = (
+            KEYWORD_WEIGHT * coverage
+            + SECTION_WEIGHT * section_ratio
+            + FORMAT_WEIGHT * format_ratio
+        )
+        result.update({
+            "keyword_coverage": round(coverage * 100, 1),
+            "matched_keywords": found,
+            "missing_keywords": missing,
+        })
+    else:
+        scale = 100 / (SECTION_WEIGHT + FORMAT_WEIGHT)
+        score = scale * (SECTION_WEIGHT * section_ratio + FORMAT_WEIGHT * format_ratio)
+        result.update({"keyword_coverage": None, "matched_keywords": [], "missing_keywords": []})
+
+    result["score"] = int(round(float(score)))
+    return result
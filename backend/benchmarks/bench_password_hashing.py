@@ -0,0 +1,82 @@
+"""
+Logins/sec versus bcrypt worker count.
+
+Runs `--logins` password verifications with `--concurrency` concurrent
+callers, first inline on the event loop (the old behaviour), then
+through PasswordHasher with each worker count. Also reports the worst
+event-loop stall seen by a 10 ms ticker, which is what every other
+request on the server would feel.
+
+    cd backend
+    python benchmarks/bench_password_hashing.py --workers 1 2 4 8
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passwords import PasswordHasher, pwd_context, BCRYPT_ROUNDS  # noqa: E402
+
+
+async def _ticker(stop: asyncio.Event, stalls: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - start - 0.01)
+
+
+async def run(verify, logins: int, concurrency: int, stored_hash: str):
+    latencies, stalls = [], []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop, stalls))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            await verify("correct horse battery staple", stored_hash)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    latencies.sort()
+    return {
+        "logins_per_sec": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_loop_stall_ms": max(stalls, default=0.0) * 1000,
+    }
+
+
+async def main(args):
+    stored_hash = pwd_context.hash("correct horse battery staple")
+    print(f"bcrypt rounds={BCRYPT_ROUNDS} logins={args.logins} concurrency={args.concurrency} cpus={os.cpu_count()}")
+    print(f"{'mode':<14}{'logins/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'loop stall ms':>16}")
+
+    async def inline_verify(password, hashed):
+        return pwd_context.verify_and_update(password, hashed)
+
+    rows = [("inline", await run(inline_verify, args.logins, args.concurrency, stored_hash))]
+    for workers in args.workers:
+        hasher = PasswordHasher(workers=workers, max_queue=args.logins)
+        rows.append((f"{workers} workers", await run(hasher.verify, args.logins, args.concurrency, stored_hash)))
+        hasher.shutdown()
+
+    for name, r in rows:
+        print(f"{name:<14}{r['logins_per_sec']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_loop_stall_ms']:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""
+In-process MongoDB stand-in for load tests.
+
+Wraps mongomock collections in the subset of pymongo's async API the
+app uses, and swaps them into database.py and the modules that import
+collections from it. Use a real local mongod (MONGO_URI) instead when
+you want storage costs included in the numbers.
+
+Requires `pip install -r benchmarks/requirements.txt`.
+"""
+from types import SimpleNamespace
+import mongomock
+from pymongo import UpdateOne
+
+
+class AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, n):
+        self._cursor = self._cursor.limit(n)
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._cursor:
+            yield doc
+
+
+class AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    async def create_index(self, keys, **kwargs):
+        # mongomock does not understand TTL/text options; the index itself is irrelevant here
+        kwargs.pop("expireAfterSeconds", None)
+        kwargs.pop("weights", None)
+        try:
+            return self._collection.create_index(keys, **kwargs)
+        except Exception:
+            return None
+
+    async def bulk_write(self, requests, ordered=True):
+        # mongomock's bulk API rejects newer pymongo UpdateOne options, so apply them one by one
+        upserted = modified = 0
+        for op in requests:
+            if not isinstance(op, UpdateOne):
+                raise NotImplementedError(f"fake_mongo bulk_write does not support {type(op).__name__}")
+            result = self._collection.update_one(op._filter, op._doc, upsert=op._upsert)
+            upserted += result.upserted_id is not None
+            modified += result.modified_count
+        return SimpleNamespace(upserted_count=upserted, modified_count=modified)
+
+    async def estimated_document_count(self):
+        return self._collection.count_documents({})
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class AsyncDatabase:
+    def __init__(self, db):
+        self._db = db
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = AsyncCollection(self._db[name])
+        return self._collections[name]
+
+
+def install():
+    """Point every module that talks to Mongo at one shared in-memory database."""
+    import database
+    import job_store
+    import reset_tokens
+
+    db = AsyncDatabase(mongomock.MongoClient()["ai_job_navigator"])
+    database.db = db
+    database.users_collection = db["users"]
+    database.jobs_collection = db["jobs"]
+    database.reset_tokens_collection = db["reset_tokens"]
+    job_store.jobs_collection = db["jobs"]
+    reset_tokens.reset_tokens_collection = db["reset_tokens"]
+    return db
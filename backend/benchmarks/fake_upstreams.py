@@ -0,0 +1,285 @@
+"""
+Local stand-ins for every external service the API talks to.
+
+One aiohttp server emulates:
+    POST /openai/v1/chat/completions   Groq (JSON and streamed SSE)
+    GET  /jsearch/search               RapidAPI JSearch
+    GET  /customsearch/v1              Google Custom Search
+    GET  /youtube/v3/search            YouTube Data API
+plus a minimal SMTP sink that accepts mail (and bounces recipients whose
+address starts with "bounce").
+
+Latency and error rate are configurable per upstream, so the load test
+measures our own overhead instead of third-party variance.
+
+    python benchmarks/fake_upstreams.py --port 9100 --smtp-port 9125 --llm-latency-ms 800
+"""
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from aiohttp import web
+
+SKILLS = ["Python", "SQL", "Docker", "React", "Machine Learning", "FastAPI", "AWS"]
+RESUME_TEXT = """PROFESSIONAL SUMMARY
+Backend developer who builds reliable APIs and data pipelines.
+TECHNICAL SKILLS
+- Python, FastAPI, SQL, Docker, AWS
+EXPERIENCE
+- Built a job matching service handling 50k requests per day
+- Reduced report generation time by 40%
+EDUCATION
+B.Tech in Computer Science, 2024
+PROJECTS
+- AI resume scorer using LLMs and PDF parsing
+CERTIFICATIONS
+- AWS Certified Cloud Practitioner"""
+
+
+class Upstream:
+    def __init__(self, name: str, latency_ms: float, jitter_ms: float, error_rate: float):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+
+    async def delay(self, fraction: float = 1.0):
+        ms = max(self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms), 0)
+        await asyncio.sleep(ms * fraction / 1000)
+
+    def should_fail(self) -> bool:
+        self.requests += 1
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+
+def _llm_reply(messages: list) -> str:
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    if "JSON array of technical and soft skills" in prompt:
+        return json.dumps(random.sample(SKILLS, 4))
+    if "rank the following jobs" in prompt:
+        return "[]"
+    if '"score"' in prompt:
+        return json.dumps({
+            "score": random.randint(55, 90),
+            "strengths": ["Clear project impact", "Relevant stack"],
+            "weaknesses": ["Summary is generic"],
+            "suggestions": ["Quantify more achievements"],
+        })
+    if "resume" in prompt.lower() and "professional summary" in prompt.lower():
+        return RESUME_TEXT
+    return "Machine learning lets computers learn patterns from data instead of explicit rules."
+
+
+def _completion(model: str, content: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+            "logprobs": None,
+        }],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _chunk(chunk_id: str, model: str, delta: dict, finish_reason=None) -> bytes:
+    payload = {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}],
+    }
+    return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+
+def build_app(args) -> web.Application:
+    llm = Upstream("groq", args.llm_latency_ms, args.jitter_ms, args.error_rate)
+    jsearch = Upstream("jsearch", args.search_latency_ms, args.jitter_ms, args.error_rate)
+    google = Upstream("google", args.search_latency_ms, args.jitter_ms, args.error_rate)
+    youtube = Upstream("youtube", args.youtube_latency_ms, args.jitter_ms, args.error_rate)
+
+    async def chat_completions(request):
+        body = await request.json()
+        model = body.get("model", "fake-model")
+        if llm.should_fail():
+            await llm.delay(0.1)
+            return web.json_response({"error": {"message": "fake upstream error"}}, status=500)
+
+        content = _llm_reply(body.get("messages", []))
+        if not body.get("stream"):
+            await llm.delay()
+            return web.json_response(_completion(model, content))
+
+        # Streamed: first token after ~20% of the latency, the rest spread evenly
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        words = content.split(" ")
+        await llm.delay(0.2)
+        for i, word in enumerate(words):
+            await response.write(_chunk(chunk_id, model, {"content": word + (" " if i < len(words) - 1 else "")}))
+            await llm.delay(0.8 / len(words))
+        await response.write(_chunk(chunk_id, model, {}, finish_reason="stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def jsearch_search(request):
+        await jsearch.delay()
+        if jsearch.should_fail():
+            return web.json_response({"message": "fake upstream error"}, status=500)
+        query = request.query.get("query", "developer")
+        return web.json_response({"data": [
+            {
+                "job_title": f"{random.choice(SKILLS)} Developer",
+                "employer_name": f"Company {i}",
+                "job_city": "Bengaluru",
+                "job_apply_link": f"https://jobs.example.com/{uuid.uuid4().hex}",
+                "job_posted_at_datetime_utc": "2026-01-01T00:00:00Z",
+                "job_description": f"Looking for {query} with {', '.join(random.sample(SKILLS, 3))}.",
+            }
+            for i in range(10)
+        ]})
+
+    async def google_search(request):
+        await google.delay()
+        if google.should_fail():
+            return web.json_response({"error": {"message": "fake upstream error"}}, status=500)
+        return web.json_response({"items": [
+            {
+                "title": f"{random.choice(SKILLS)} Engineer - Company {i}",
+                "displayLink": "www.example.com",
+                "link": f"https://careers.example.com/{uuid.uuid4().hex}",
+                "snippet": f"Hiring engineers skilled in {', '.join(random.sample(SKILLS, 3))}.",
+            }
+            for i in range(10)
+        ]})
+
+    async def youtube_search(request):
+        await youtube.delay()
+        if youtube.should_fail():
+            return web.json_response({"error": {"code": 503, "errors": [{"reason": "backendError"}]}}, status=503)
+        q = request.query.get("q", "")
+        return web.json_response({"items": [
+            {
+                "id": {"videoId": uuid.uuid4().hex[:11]},
+                "snippet": {
+                    "title": f"{q} tutorial part {i}",
+                    "channelTitle": "Fake Channel",
+                    "thumbnails": {"high": {"url": "https://img.example.com/t.jpg"}},
+                },
+            }
+            for i in range(6)
+        ]})
+
+    async def stats(request):
+        return web.json_response({u.name: {"requests": u.requests, "errors": u.errors}
+                                  for u in (llm, jsearch, google, youtube)})
+
+    app = web.Application()
+    app.router.add_post("/openai/v1/chat/completions", chat_completions)
+    app.router.add_get("/jsearch/search", jsearch_search)
+    app.router.add_get("/customsearch/v1", google_search)
+    app.router.add_get("/youtube/v3/search", youtube_search)
+    app.router.add_get("/_stats", stats)
+    return app
+
+
+# =====================================================
+# 🔹 SMTP sink
+# =====================================================
+def smtp_sink(inbox: list = None):
+    """
+    asyncio.start_server handler for a tiny SMTP server. Accepted messages
+    are appended to `inbox` as (recipients, raw message) when one is given;
+    RCPT TO addresses starting with "bounce" get a permanent 550.
+    """
+    async def session(reader, writer):
+        def reply(line: str):
+            writer.write((line + "\r\n").encode())
+
+        recipients = []
+        reply("220 fake-smtp ready")
+        try:
+            while line := await reader.readline():
+                text = line.decode(errors="replace").strip()
+                command = text.upper()
+                if command.startswith(("EHLO", "HELO")):
+                    reply("250 fake-smtp")
+                elif command.startswith("RCPT"):
+                    address = text.partition(":")[2].strip(" <>")
+                    if address.lower().startswith("bounce"):
+                        reply("550 No such user")
+                    else:
+                        recipients.append(address)
+                        reply("250 OK")
+                elif command.startswith(("MAIL", "RSET")):
+                    recipients = []
+                    reply("250 OK")
+                elif command.startswith("NOOP"):
+                    reply("250 OK")
+                elif command == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    lines = []
+                    while (data := await reader.readline()) not in (b".\r\n", b""):
+                        lines.append(data)
+                    if inbox is not None:
+                        inbox.append((recipients, b"".join(lines)))
+                    recipients = []
+                    reply("250 OK queued")
+                elif command == "QUIT":
+                    reply("221 Bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 Command not implemented")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return session
+
+
+async def serve(args):
+    runner = web.AppRunner(build_app(args), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    smtp = await asyncio.start_server(smtp_sink(), args.host, args.smtp_port)
+    print(f"fake upstreams on http://{args.host}:{args.port}, smtp on {args.host}:{args.smtp_port}", flush=True)
+    async with smtp:
+        await asyncio.Event().wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-ins for Groq, JSearch, Google, YouTube and SMTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--smtp-port", type=int, default=9125)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=300)
+    parser.add_argument("--youtube-latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that fail")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
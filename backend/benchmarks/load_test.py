@@ -0,0 +1,271 @@
+"""
+End-to-end load test for main.app.
+
+Starts fake_upstreams.py (Groq, JSearch, Google, YouTube, SMTP) and
+serve_app.py (uvicorn + the app pointed at those fakes, on the Mongo
+stand-in unless --mongo-uri is given), then drives each route with a
+closed loop of `concurrency` clients and reports requests/sec and
+p50/p95/p99 latency per route and concurrency level.
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/load_test.py --concurrency 1 10 50 --requests 200
+    python benchmarks/load_test.py --routes ask upload_resume --llm-latency-ms 1500 --error-rate 0.05
+    python benchmarks/load_test.py --app-url http://127.0.0.1:8000   # already running app
+
+Run it on the same commit before and after a change, with the same
+flags, and compare the tables (or the --json output).
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import itertools
+import subprocess
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+_ids = itertools.count()
+RUN_ID = f"{int(time.time())}"
+JOB_DESCRIPTION = (
+    "We are hiring a backend developer with Python, FastAPI, SQL and Docker experience. "
+    "Knowledge of AWS and CI/CD is a plus."
+)
+LOGIN_EMAIL = f"bench-login-{RUN_ID}@example.com"
+LOGIN_PASSWORD = "bench-password"
+
+
+# =====================================================
+# 🔹 Scenarios: name -> request builder (unique id -> aiohttp kwargs)
+# =====================================================
+def _resume_pdf() -> bytes:
+    from pdf_render import render_resume_pdf
+    from fake_upstreams import RESUME_TEXT
+    return render_resume_pdf("Bench User", "bench@example.com", "+91 90000 00000", RESUME_TEXT)
+
+
+def _pdf_form(pdf: bytes, field: str, **fields) -> aiohttp.FormData:
+    form = aiohttp.FormData()
+    form.add_field(field, pdf, filename="resume.pdf", content_type="application/pdf")
+    for name, value in fields.items():
+        form.add_field(name, value)
+    return form
+
+
+def build_scenarios(pdf: bytes) -> dict:
+    return {
+        "home": lambda i: ("GET", "/", {}),
+        "ask_cached": lambda i: ("POST", "/api/ask", {"json": {"query": "What is machine learning?"}}),
+        "ask": lambda i: ("POST", "/api/ask", {"json": {"query": f"Explain topic {RUN_ID}-{i}"}}),
+        "ask_stream": lambda i: ("POST", "/api/ask/stream", {"json": {"query": f"Explain topic {RUN_ID}-{i}"}}),
+        "chat": lambda i: ("POST", "/api/chat", {"json": {"message": f"How do I use feature {RUN_ID}-{i}?"}}),
+        # 50 distinct titles: a mix of job-search cache hits and misses
+        "upload_resume": lambda i: ("POST", f"/api/upload_resume/?title=developer{i % 50}",
+                                    {"data": _pdf_form(pdf, "file")}),
+        "resume_score_fast": lambda i: ("POST", "/api/resume_score",
+                                        {"data": _pdf_form(pdf, "resume", mode="fast", job_description=JOB_DESCRIPTION)}),
+        "resume_score_llm": lambda i: ("POST", "/api/resume_score",
+                                       {"data": _pdf_form(pdf, "resume", mode="llm", job_description=f"{JOB_DESCRIPTION} {i}")}),
+        "generate_resume": lambda i: ("POST", "/api/resume/generate-ai", {"json": {
+            "name": "Bench User", "email": "bench@example.com", "phone": "+91 90000 00000",
+            "skills": f"Python, SQL, Docker {i}", "role_type": "Backend Developer",
+        }}),
+        "youtube": lambda i: ("GET", f"/api/youtube_videos?q=python+{i % 20}", {}),
+        "signup": lambda i: ("POST", "/auth/signup", {"json": {
+            "name": "Bench", "email": f"bench-{RUN_ID}-{i}@example.com", "password": "bench-password",
+        }}),
+        "login": lambda i: ("POST", "/auth/login", {"json": {"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD}}),
+        "admin_users": lambda i: ("GET", "/api/admin/users?limit=50", {}),
+        "metrics": lambda i: ("GET", "/metrics", {}),
+    }
+
+
+async def setup(session: aiohttp.ClientSession, base_url: str):
+    """State some scenarios need (a user to log in as)."""
+    async with session.post(f"{base_url}/auth/signup", json={
+        "name": "Bench", "email": LOGIN_EMAIL, "password": LOGIN_PASSWORD,
+    }) as resp:
+        await resp.read()
+
+
+# =====================================================
+# 🔹 Load generation
+# =====================================================
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(p / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_level(session, base_url: str, build, concurrency: int, total: int) -> dict:
+    latencies, errors, statuses = [], 0, {}
+    remaining = itertools.count()
+
+    async def client():
+        nonlocal errors
+        while next(remaining) < total:
+            method, path, kwargs = build(next(_ids))
+            start = time.perf_counter()
+            try:
+                async with session.request(method, f"{base_url}{path}", **kwargs) as resp:
+                    await resp.read()  # streamed routes count until the last byte
+                    status = resp.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = "conn_error"
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "conn_error" or status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+async def run(args, base_url: str) -> dict:
+    scenarios = build_scenarios(_resume_pdf())
+    unknown = set(args.routes or []) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(sorted(unknown))}. Choose from: {', '.join(scenarios)}")
+    names = args.routes or list(scenarios)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    results = {}
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await setup(session, base_url)
+        print(f"{'route':<20}{'conc':>6}{'reqs':>7}{'errs':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name in names:
+            build = scenarios[name]
+            await run_level(session, base_url, build, 1, args.warmup)
+            results[name] = []
+            for concurrency in args.concurrency:
+                r = await run_level(session, base_url, build, concurrency, max(args.requests, concurrency))
+                results[name].append(r)
+                print(f"{name:<20}{r['concurrency']:>6}{r['requests']:>7}{r['errors']:>6}"
+                      f"{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}", flush=True)
+    return results
+
+
+# =====================================================
+# 🔹 Process orchestration
+# =====================================================
+def _wait_for_port(host: str, port: int, proc: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"{proc.args[1]} exited with code {proc.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"Timed out waiting for {host}:{port}")
+
+
+def app_env(args) -> dict:
+    fake = f"http://{args.host}:{args.upstream_port}"
+    env = {
+        **os.environ,
+        "GROQ_BASE_URL": fake,
+        "GROQ_API_KEY": "fake-groq-key",
+        "RAPIDAPI_KEY": "fake-rapidapi-key",
+        "GOOGLE_API_KEY": "fake-google-key",
+        "GOOGLE_CX_ID": "fake-cx",
+        "YOUTUBE_API_KEY": "fake-youtube-key",
+        "JSEARCH_URL": f"{fake}/jsearch/search",
+        "GOOGLE_SEARCH_URL": f"{fake}/customsearch/v1",
+        "YOUTUBE_SEARCH_URL": f"{fake}/youtube/v3/search",
+        "SMTP_HOST": args.host,
+        "SMTP_PORT": str(args.smtp_port),
+        "SMTP_TLS": "none",
+        "EMAIL_USER": "",
+        "EMAIL_PASS": "",
+        "EMAIL_FROM": "bench@example.com",
+    }
+    if args.mongo_uri:
+        env["MONGO_URI"] = args.mongo_uri
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test main.app against local stand-ins")
+    parser.add_argument("--routes", nargs="+", help="subset of scenarios (default: all)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--app-url", help="benchmark an already running app instead of starting one")
+    parser.add_argument("--mongo-uri", help="real MongoDB to use instead of the in-memory stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--app-port", type=int, default=8100)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    parser.add_argument("--smtp-port", type=int, default=9125)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=300)
+    parser.add_argument("--youtube-latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    procs = []
+    try:
+        if args.app_url:
+            base_url = args.app_url.rstrip("/")
+        else:
+            upstreams = subprocess.Popen([
+                sys.executable, os.path.join(BENCH_DIR, "fake_upstreams.py"),
+                "--host", args.host, "--port", str(args.upstream_port), "--smtp-port", str(args.smtp_port),
+                "--llm-latency-ms", str(args.llm_latency_ms),
+                "--search-latency-ms", str(args.search_latency_ms),
+                "--youtube-latency-ms", str(args.youtube_latency_ms),
+                "--jitter-ms", str(args.jitter_ms), "--error-rate", str(args.error_rate),
+            ])
+            procs.append(upstreams)
+            _wait_for_port(args.host, args.upstream_port, upstreams)
+
+            serve_cmd = [sys.executable, os.path.join(BENCH_DIR, "serve_app.py"),
+                         "--host", args.host, "--port", str(args.app_port)]
+            if not args.mongo_uri:
+                serve_cmd.append("--fake-mongo")
+            app = subprocess.Popen(serve_cmd, env=app_env(args), cwd=BACKEND_DIR)
+            procs.append(app)
+            _wait_for_port(args.host, args.app_port, app)
+            base_url = f"http://{args.host}:{args.app_port}"
+
+        results = asyncio.run(run(args, base_url))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"run_id": RUN_ID, "args": vars(args), "results": results}, f, indent=2)
+            print(f"Results written to {args.json}")
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Run main.app under uvicorn for load testing, optionally on the
+in-process Mongo stand-in. Point the upstream base URLs at
+fake_upstreams.py through the environment before starting it
+(load_test.py does this for you).
+
+    python benchmarks/serve_app.py --port 8100 --fake-mongo
+"""
+import os
+import sys
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--fake-mongo", action="store_true", help="use the in-memory Mongo stand-in")
+    args = parser.parse_args()
+
+    os.chdir(BACKEND_DIR)
+    import uvicorn
+    import main as app_module
+
+    if args.fake_mongo:
+        import fake_mongo
+        fake_mongo.install()
+
+    uvicorn.run(app_module.app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+
+# =====================================================
+# 🔹 In-memory LRU cache with optional TTL
+# =====================================================
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache. Entries older than `ttl` seconds are treated as
+    missing (ttl=None keeps them until evicted). Thread-safe, so it can
+    be shared between the event loop and executor threads.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def items(self) -> list:
+        """Snapshot of unexpired (key, value) pairs; not counted as lookups."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# =====================================================
+# 🔹 Async stale-while-revalidate cache
+# =====================================================
+class StaleWhileRevalidateCache:
+    """
+    Async cache for expensive upstream calls. Entries younger than `ttl`
+    are served directly; entries up to `ttl + stale_ttl` old are served
+    immediately while one background task refreshes them; anything older
+    is fetched inline. If that inline fetch fails, the expired value is
+    still returned when one is left (until LRU eviction); otherwise the
+    error propagates. Empty results are not cached unless cache_empty.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, maxsize: int = 512, cache_empty: bool = False):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache_empty = cache_empty
+        self._entries = TTLCache(maxsize=maxsize)
+        self._refreshing = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallback_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def get_or_fetch(self, key, fetch):
+        """Return the cached value for key, calling `await fetch()` when needed."""
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry[1] if entry is not None else None
+        if entry is None or age >= self.ttl + self.stale_ttl:
+            self.misses += 1
+            try:
+                value = await fetch()
+            except Exception as e:
+                if entry is None:
+                    raise
+                self.fallback_hits += 1
+                print(f"⚠️ Cache fetch failed, serving expired entry: {e}")
+                return entry[0]
+            self._store(key, value)
+            return value
+
+        value = entry[0]
+        if age < self.ttl:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+            if key not in self._refreshing:
+                self._refreshing[key] = asyncio.create_task(self._refresh(key, fetch))
+        return value
+
+    def _store(self, key, value):
+        if value or self.cache_empty:
+            self._entries.set(key, (value, time.monotonic()))
+
+    async def _refresh(self, key, fetch):
+        try:
+            self._store(key, await fetch())
+            self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"⚠️ Background cache refresh failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        served = self.hits + self.stale_hits
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallback_hits": self.fallback_hits,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,167 @@
+import os
+from dataclasses import dataclass, field
+from dotenv import load_dotenv, find_dotenv
+
+# =====================================================
+# 🔹 Settings (read once per process)
+# =====================================================
+# The .env file is loaded here and nowhere else; real environment
+# variables win over it. Every module reads its configuration from
+# `settings` instead of calling os.getenv itself. Integrations whose
+# keys are missing are reported as disabled rather than failing import.
+load_dotenv(find_dotenv())
+
+_CPU_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _str(name: str, default: str = None):
+    return field(default_factory=lambda: os.getenv(name) or default)
+
+
+def _int(name: str, default: int):
+    return field(default_factory=lambda: int(os.getenv(name, str(default))))
+
+
+def _float(name: str, default: float):
+    return field(default_factory=lambda: float(os.getenv(name, str(default))))
+
+
+def _bool(name: str, default: bool = False):
+    return field(default_factory=lambda: os.getenv(name, str(default)).lower() == "true")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # 🔹 Integrations (optional)
+    groq_api_key: str = _str("GROQ_API_KEY")
+    rapidapi_key: str = _str("RAPIDAPI_KEY")
+    google_api_key: str = _str("GOOGLE_API_KEY")
+    google_cx_id: str = _str("GOOGLE_CX_ID")
+    youtube_api_key: str = _str("YOUTUBE_API_KEY")
+    jsearch_url: str = _str("JSEARCH_URL", "https://jsearch.p.rapidapi.com/search")
+    google_search_url: str = _str("GOOGLE_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
+    youtube_search_url: str = _str("YOUTUBE_SEARCH_URL", "https://www.googleapis.com/youtube/v3/search")
+    frontend_url: str = _str("FRONTEND_URL", "http://localhost:5173")
+
+    # 🔹 MongoDB
+    mongo_uri: str = _str("MONGO_URI")
+    mongo_max_pool_size: int = _int("MONGO_MAX_POOL_SIZE", 50)
+    mongo_min_pool_size: int = _int("MONGO_MIN_POOL_SIZE", 0)
+    mongo_timeout_ms: int = _int("MONGO_TIMEOUT_MS", 5000)
+    users_page_size: int = _int("USERS_PAGE_SIZE", 50)
+    users_page_max: int = _int("USERS_PAGE_MAX", 500)
+
+    # 🔹 LLM gateway
+    llm_max_concurrency: int = _int("LLM_MAX_CONCURRENCY", 8)
+    llm_batch_max_concurrency: int = _int("LLM_BATCH_MAX_CONCURRENCY", 4)
+    llm_max_connections: int = _int("LLM_MAX_CONNECTIONS", 32)
+    llm_timeout: float = _float("LLM_TIMEOUT", 60)
+
+    # 🔹 Outbound HTTP pool
+    http_pool_limit: int = _int("HTTP_POOL_LIMIT", 100)
+    http_pool_limit_per_host: int = _int("HTTP_POOL_LIMIT_PER_HOST", 20)
+    http_timeout: float = _float("HTTP_TIMEOUT", 15)
+    http_connect_timeout: float = _float("HTTP_CONNECT_TIMEOUT", 5)
+
+    # 🔹 Uploads and PDF processing
+    max_upload_bytes: int = _int("MAX_UPLOAD_BYTES", 10 * 1024 * 1024)
+    max_pdf_pages: int = _int("MAX_PDF_PAGES", 20)
+    pdf_text_cache_size: int = _int("PDF_TEXT_CACHE_SIZE", 256)
+    pdf_text_cache_dir: str = _str("PDF_TEXT_CACHE_DIR")  # unset = memory only
+    pdf_parse_workers: int = _int("PDF_PARSE_WORKERS", _CPU_WORKERS)
+    pdf_render_workers: int = _int("PDF_RENDER_WORKERS", _CPU_WORKERS)
+
+    # 🔹 Job search
+    job_cache_ttl: int = _int("JOB_CACHE_TTL", 1800)
+    job_cache_stale_ttl: int = _int("JOB_CACHE_STALE_TTL", 6 * 3600)
+    job_cache_size: int = _int("JOB_CACHE_SIZE", 512)
+    rerank_top_k: int = _int("RERANK_TOP_K", 10)
+    local_min_results: int = _int("LOCAL_MIN_RESULTS", 10)
+    job_store_ttl: int = _int("JOB_STORE_TTL", 30 * 24 * 3600)
+    local_search_limit: int = _int("LOCAL_SEARCH_LIMIT", 200)
+    local_min_skills: int = _int("LOCAL_MIN_SKILLS", 6)
+    skill_cache_ttl: int = _int("SKILL_CACHE_TTL", 7 * 24 * 3600)
+    skill_cache_size: int = _int("SKILL_CACHE_SIZE", 1024)
+    skill_cache_persist: bool = _bool("SKILL_CACHE_PERSIST")
+
+    # 🔹 YouTube search cache and daily quota
+    youtube_cache_fresh_ttl: int = _int("YOUTUBE_CACHE_FRESH_TTL", 24 * 3600)
+    youtube_cache_ttl: int = _int("YOUTUBE_CACHE_TTL", 30 * 24 * 3600)
+    youtube_cache_size: int = _int("YOUTUBE_CACHE_SIZE", 4096)
+    youtube_cache_persist: bool = _bool("YOUTUBE_CACHE_PERSIST", True)
+    youtube_daily_quota: int = _int("YOUTUBE_DAILY_QUOTA", 10000)
+    youtube_search_cost: int = _int("YOUTUBE_SEARCH_COST", 100)
+    youtube_quota_reserve: int = _int("YOUTUBE_QUOTA_RESERVE", 2000)
+    youtube_quota_tz: str = _str("YOUTUBE_QUOTA_TZ", "America/Los_Angeles")
+    youtube_related_min_overlap: float = _float("YOUTUBE_RELATED_MIN_OVERLAP", 0.5)
+
+    # 🔹 Answer cache (/api/ask, /api/chat)
+    answer_cache_ttl: int = _int("ANSWER_CACHE_TTL", 24 * 3600)
+    answer_cache_size: int = _int("ANSWER_CACHE_SIZE", 2048)
+
+    # 🔹 Resume generation and scoring batches
+    resume_batch_concurrency: int = _int("RESUME_BATCH_CONCURRENCY", 8)
+    resume_batch_max_size: int = _int("RESUME_BATCH_MAX_SIZE", 500)
+    score_batch_concurrency: int = _int("SCORE_BATCH_CONCURRENCY", 8)
+    score_batch_max_size: int = _int("SCORE_BATCH_MAX_SIZE", 500)
+    score_batch_max_zip_bytes: int = _int("SCORE_BATCH_MAX_ZIP_BYTES", 200 * 1024 * 1024)
+    score_batch_max_total_bytes: int = _int("SCORE_BATCH_MAX_TOTAL_BYTES", 200 * 1024 * 1024)
+    jd_digest_min_chars: int = _int("JD_DIGEST_MIN_CHARS", 1500)
+
+    # 🔹 Passwords and reset tokens
+    bcrypt_rounds: int = _int("BCRYPT_ROUNDS", 12)
+    password_hash_workers: int = _int("PASSWORD_HASH_WORKERS", _CPU_WORKERS)
+    password_hash_max_queue: int = _int("PASSWORD_HASH_MAX_QUEUE", 256)
+    reset_token_ttl: int = _int("RESET_TOKEN_TTL", 3600)
+    reset_token_cache_size: int = _int("RESET_TOKEN_CACHE_SIZE", 4096)
+
+    # 🔹 Email
+    smtp_host: str = _str("SMTP_HOST", "smtp.gmail.com")
+    smtp_port: int = _int("SMTP_PORT", 587)
+    smtp_tls: str = field(default_factory=lambda: os.getenv("SMTP_TLS", "starttls").lower())  # starttls | ssl | none
+    smtp_timeout: float = _float("SMTP_TIMEOUT", 30)
+    smtp_idle_timeout: float = _float("SMTP_IDLE_TIMEOUT", 60)
+    email_user: str = _str("EMAIL_USER")
+    email_pass: str = _str("EMAIL_PASS")
+    email_from: str = field(default_factory=lambda: os.getenv("EMAIL_FROM") or os.getenv("EMAIL_USER") or None)
+    mail_workers: int = _int("MAIL_WORKERS", 2)
+    mail_queue_size: int = _int("MAIL_QUEUE_SIZE", 1000)
+    mail_batch_size: int = _int("MAIL_BATCH_SIZE", 20)
+    mail_max_attempts: int = _int("MAIL_MAX_ATTEMPTS", 5)
+    mail_retry_base_delay: float = _float("MAIL_RETRY_BASE_DELAY", 2)
+    mail_drain_timeout: float = _float("MAIL_DRAIN_TIMEOUT", 10)
+
+    # 🔹 Optional features
+    @property
+    def llm_enabled(self) -> bool:
+        return bool(self.groq_api_key)
+
+    @property
+    def jsearch_enabled(self) -> bool:
+        return bool(self.rapidapi_key)
+
+    @property
+    def google_search_enabled(self) -> bool:
+        return bool(self.google_api_key and self.google_cx_id)
+
+    @property
+    def youtube_enabled(self) -> bool:
+        return bool(self.youtube_api_key)
+
+    @property
+    def mail_enabled(self) -> bool:
+        return bool(self.email_from)
+
+    def disabled_features(self) -> list:
+        """Human-readable list of integrations turned off by missing settings."""
+        checks = [
+            (self.llm_enabled, "AI features (GROQ_API_KEY)"),
+            (self.jsearch_enabled, "JSearch job search (RAPIDAPI_KEY)"),
+            (self.google_search_enabled, "Google job search (GOOGLE_API_KEY, GOOGLE_CX_ID)"),
+            (self.youtube_enabled, "YouTube search (YOUTUBE_API_KEY)"),
+            (self.mail_enabled, "email (EMAIL_FROM or EMAIL_USER)"),
+        ]
+        return [name for enabled, name in checks if not enabled]
+
+
+settings = Settings()
@@ -1,31 +1,172 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
-import os
-from dotenv import load_dotenv
+import re
+import json
+import base64
+from config import settings
 
-# Load environment variables from .env file
-load_dotenv()
+# ✅ MongoDB settings (see config.py)
+MONGO_URI = settings.mongo_uri
+MONGO_MAX_POOL_SIZE = settings.mongo_max_pool_size
+MONGO_MIN_POOL_SIZE = settings.mongo_min_pool_size
+MONGO_TIMEOUT_MS = settings.mongo_timeout_ms
+USERS_PAGE_SIZE = settings.users_page_size
+USERS_PAGE_MAX = settings.users_page_max
 
-# ✅ Get MongoDB URI from environment
-MONGO_URI = os.getenv("MONGO_URI")
-
-# ✅ Connect to MongoDB
-client = MongoClient(MONGO_URI)
+# ✅ Connect to MongoDB (async driver; connections open lazily on first use)
+client = AsyncMongoClient(
+    MONGO_URI,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+)
 db = client["ai_job_navigator"]
 
 # ✅ Collections
 users_collection = db["users"]
 jobs_collection = db["jobs"]
+reset_tokens_collection = db["reset_tokens"]
+
+# ✅ Projections: never read more of a user than the caller needs
+USER_PUBLIC_FIELDS = {"name": 1, "email": 1, "signup_date": 1}
+USER_AUTH_FIELDS = {"name": 1, "email": 1, "password": 1}
+
+
+# =====================================================
+# 🔹 Indexes (ensured once at startup)
+# =====================================================
+async def ensure_indexes():
+    await users_collection.create_index("email", unique=True, name="email_unique")
+    # Keyset pagination: every sortable field is paired with _id as tiebreaker
+    await users_collection.create_index([("signup_date", DESCENDING), ("_id", DESCENDING)])
+    await users_collection.create_index([("name", ASCENDING), ("_id", ASCENDING)])
+    await users_collection.create_index([("email", ASCENDING), ("_id", ASCENDING)])
+
+
+async def init():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not ensure user indexes: {e}")
+
+
+async def close():
+    await client.close()
+
+
+# =====================================================
+# 🔹 Users
+# =====================================================
+def _public_user(user: dict) -> dict:
+    return {
+        "id": str(user["_id"]),
+        "name": user.get("name", ""),
+        "email": user.get("email", ""),
+        "signup_date": user.get("signup_date", "")
+    }
+
+
+async def find_user_by_email(email: str, projection: dict = USER_PUBLIC_FIELDS):
+    return await users_collection.find_one({"email": email}, projection)
+
+
+async def user_exists(email: str) -> bool:
+    return await users_collection.find_one({"email": email}, {"_id": 1}) is not None
+
+
+async def create_user(user_data: dict) -> bool:
+    """Insert a user; False if the email is already registered."""
+    try:
+        await users_collection.insert_one(user_data)
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def update_password(query: dict, hashed_password: str) -> int:
+    result = await users_collection.update_one(query, {"$set": {"password": hashed_password}})
+    return result.modified_count
+
+
+async def delete_user(user_id: str) -> bool:
+    if not ObjectId.is_valid(user_id):
+        return False
+    result = await users_collection.delete_one({"_id": ObjectId(user_id)})
+    return result.deleted_count == 1
+
+
+# =====================================================
+# 🔹 User listing (keyset pagination)
+# =====================================================
+# Pages are addressed by an opaque cursor holding the (sort value, _id)
+# of the last user returned, so each page is an index range scan no
+# matter how deep into the collection it is. Missing sort values are
+# null in Mongo, which sorts before every string.
+USER_SORT_FIELDS = ("signup_date", "name", "email")
+
+
+def encode_cursor(user: dict, sort: str) -> str:
+    raw = json.dumps([user.get(sort), str(user["_id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    try:
+        value, oid = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return value, ObjectId(oid)
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+def _after(sort: str, value, oid: ObjectId, direction: int) -> dict:
+    op = "$gt" if direction == ASCENDING else "$lt"
+    same_value = {sort: value, "_id": {op: oid}}
+    if value is None:
+        # nulls come first ascending, last descending
+        return {"$or": [same_value, {sort: {"$ne": None}}]} if direction == ASCENDING else same_value
+    clauses = [{sort: {op: value}}, same_value]
+    if direction == DESCENDING:
+        clauses.append({sort: None})
+    return {"$or": clauses}
+
+
+def _users_query(search: str = None, sort: str = "signup_date", order: str = "desc", cursor: str = None):
+    if sort not in USER_SORT_FIELDS:
+        raise ValueError(f"sort must be one of {', '.join(USER_SORT_FIELDS)}.")
+    direction = ASCENDING if order == "asc" else DESCENDING
+
+    clauses = []
+    if search:
+        pattern = {"$regex": re.escape(search.strip()), "$options": "i"}
+        clauses.append({"$or": [{"name": pattern}, {"email": pattern}]})
+    if cursor:
+        value, oid = decode_cursor(cursor)
+        clauses.append(_after(sort, value, oid, direction))
+
+    query = {"$and": clauses} if len(clauses) > 1 else (clauses[0] if clauses else {})
+    return query, [(sort, direction), ("_id", direction)]
+
+
+async def list_users(limit: int = USERS_PAGE_SIZE, cursor: str = None, search: str = None,
+                     sort: str = "signup_date", order: str = "desc") -> dict:
+    """One page of users plus the cursor for the next page (None on the last)."""
+    limit = max(1, min(limit, USERS_PAGE_MAX))
+    query, sort_spec = _users_query(search, sort, order, cursor)
+
+    # Fetch one extra row to know whether another page exists
+    docs = await users_collection.find(query, USER_PUBLIC_FIELDS).sort(sort_spec).limit(limit + 1).to_list()
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+
+    page = {"users": [_public_user(user) for user in docs[:limit]], "next_cursor": next_cursor}
+    if not cursor and not search:
+        page["total"] = await users_collection.estimated_document_count()
+    return page
 
 
-# 🟩 Function: Get all users
-def get_all_users():
-    users = []
-    for user in users_collection.find():
-        users.append({
-            "id": str(user["_id"]),
-            "name": user.get("name", ""),
-            "email": user.get("email", ""),
-            "signup_date": user.get("signup_date", "")
-        })
-    return users
\ No newline at end of file
+async def iter_users(search: str = None, sort: str = "signup_date", order: str = "desc"):
+    """Stream every matching user without holding the result set in memory."""
+    query, sort_spec = _users_query(search, sort, order)
+    cursor = users_collection.find(query, USER_PUBLIC_FIELDS).sort(sort_spec).batch_size(1000)
+    async for user in cursor:
+        yield _public_user(user)
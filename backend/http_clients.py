@@ -0,0 +1,75 @@
+import time
+import aiohttp
+from config import settings
+import metrics
+
+# =====================================================
+# 🔹 Shared outbound HTTP connection pool
+# =====================================================
+# One keep-alive aiohttp session for the whole app, opened in the FastAPI
+# lifespan hook, so job search and YouTube calls reuse DNS lookups and
+# TLS connections instead of paying for them on every request.
+
+HTTP_POOL_LIMIT = settings.http_pool_limit
+HTTP_POOL_LIMIT_PER_HOST = settings.http_pool_limit_per_host
+HTTP_TIMEOUT = settings.http_timeout
+HTTP_CONNECT_TIMEOUT = settings.http_connect_timeout
+
+_session = None
+
+
+# ✅ Every request through the shared session is timed per upstream host
+async def _on_request_start(session, ctx, params):
+    ctx.start = time.perf_counter()
+
+
+async def _on_request_end(session, ctx, params):
+    host = params.url.host
+    metrics.stage_duration.observe(time.perf_counter() - ctx.start, stage="http", target=host)
+    if params.response.status >= 400:
+        metrics.upstream_errors.inc(upstream=host)
+
+
+async def _on_request_exception(session, ctx, params):
+    host = params.url.host
+    metrics.stage_duration.observe(time.perf_counter() - ctx.start, stage="http", target=host)
+    metrics.upstream_errors.inc(upstream=host)
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_request_end.append(_on_request_end)
+    trace.on_request_exception.append(_on_request_exception)
+    return trace
+
+
+async def start() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            trace_configs=[_trace_config()],
+        )
+    return _session
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Shared session; created on first use if the lifespan hook has not run."""
+    if _session is None or _session.closed:
+        return await start()
+    return _session
+
+
+async def close():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
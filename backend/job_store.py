@@ -0,0 +1,92 @@
+import re
+import asyncio
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING, TEXT, UpdateOne
+from config import settings
+from database import jobs_collection
+
+# =====================================================
+# 🔹 Local job store (jobs_collection)
+# =====================================================
+# Every job fetched from JSearch/Google is upserted here, deduped by
+# job_link. With local_first, /api/upload_resume/ answers from this
+# store and only fans out to the external APIs when recall is too low.
+
+JOB_STORE_TTL = settings.job_store_ttl
+LOCAL_SEARCH_LIMIT = settings.local_search_limit
+
+_PROJECTION = {"_id": 0, "last_seen": 0}
+_pending = set()
+
+
+async def ensure_indexes():
+    await jobs_collection.create_index("job_link", unique=True)
+    await jobs_collection.create_index(
+        [("job_title", TEXT), ("company_name", TEXT)],
+        weights={"job_title": 3, "company_name": 1},
+        name="job_text",
+    )
+    await jobs_collection.create_index([("location", ASCENDING), ("posted_date", DESCENDING)])
+    # Postings not seen in any search for JOB_STORE_TTL seconds expire.
+    await jobs_collection.create_index("last_seen", expireAfterSeconds=JOB_STORE_TTL)
+
+
+async def init():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not ensure job store indexes: {e}")
+
+
+async def upsert_jobs(jobs: list) -> int:
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne({"job_link": job["job_link"]}, {"$set": {**job, "last_seen": now}}, upsert=True)
+        for job in jobs
+        if job.get("job_link") and job["job_link"] != "#"
+    ]
+    if not ops:
+        return 0
+    result = await jobs_collection.bulk_write(ops, ordered=False)
+    return result.upserted_count + result.modified_count
+
+
+def ingest_in_background(jobs: list):
+    """Upsert freshly fetched jobs without delaying the response."""
+    async def ingest():
+        try:
+            await upsert_jobs(jobs)
+        except Exception as e:
+            print(f"⚠️ Job store ingestion failed: {e}")
+
+    task = asyncio.create_task(ingest())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _search(skills: list, title: str, location: str, remote: bool) -> list:
+    terms = [title] if title else []
+    terms += skills[:5]
+    if remote:
+        terms.append("remote")
+    if not terms:
+        return []
+
+    query = {"$text": {"$search": " ".join(terms)}}
+    if location:
+        query["location"] = {"$regex": re.escape(location), "$options": "i"}
+
+    cursor = (
+        jobs_collection.find(query, {**_PROJECTION, "score": {"$meta": "textScore"}})
+        .sort([("score", {"$meta": "textScore"})])
+        .limit(LOCAL_SEARCH_LIMIT)
+    )
+    return [{k: v for k, v in job.items() if k != "score"} async for job in cursor]
+
+
+async def search_jobs(skills: list, title: str = None, location: str = None, remote: bool = False) -> list:
+    try:
+        return await _search(skills, title, location, remote)
+    except Exception as e:
+        print(f"⚠️ Local job search failed: {e}")
+        return []
@@ -0,0 +1,213 @@
+import json
+import time
+import asyncio
+import contextvars
+from contextlib import contextmanager, asynccontextmanager
+from fastapi import HTTPException
+from config import settings
+from singleflight import SingleFlight
+import metrics
+
+# =====================================================
+# 🔹 Shared async LLM gateway
+# =====================================================
+# One pooled AsyncGroq client for every router, with a per-model
+# concurrency cap so a burst of requests queues here instead of
+# blocking the event loop. The Groq SDK is imported and the client built
+# on the first call; without GROQ_API_KEY the AI endpoints answer 503.
+#
+# Batch jobs run inside batch_priority() and must first take one of a
+# smaller set of batch slots, so together they never hold more than
+# BATCH_CONCURRENCY_PER_MODEL of a model's slots and interactive
+# endpoints (/api/ask, /api/resume_score, ...) always have room.
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+MAX_CONCURRENCY_PER_MODEL = settings.llm_max_concurrency
+BATCH_CONCURRENCY_PER_MODEL = max(1, min(settings.llm_batch_max_concurrency, MAX_CONCURRENCY_PER_MODEL - 1))
+MAX_CONNECTIONS = settings.llm_max_connections
+REQUEST_TIMEOUT = settings.llm_timeout
+
+_client = None
+_semaphores = {}
+_batch_semaphores = {}
+_stats = {}
+_batch_lane = contextvars.ContextVar("llm_batch_lane", default=False)
+
+# Identical concurrent completions (same model, messages and options)
+# share one upstream call.
+single_flight = SingleFlight()
+
+
+def require_enabled():
+    """Raise 503 when no Groq key is configured (AI features are optional)."""
+    if not settings.llm_enabled:
+        raise HTTPException(status_code=503, detail="AI features are disabled: GROQ_API_KEY is not set.")
+
+
+def get_client():
+    """Return the shared AsyncGroq client, creating it on first use."""
+    global _client
+    if _client is None:
+        require_enabled()
+        import httpx
+        from groq import AsyncGroq
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=10.0),
+        )
+        _client = AsyncGroq(api_key=settings.groq_api_key, http_client=http_client)
+    return _client
+
+
+@contextmanager
+def batch_priority():
+    """LLM calls made inside this block (in the current task) use the batch lane."""
+    token = _batch_lane.set(True)
+    try:
+        yield
+    finally:
+        _batch_lane.reset(token)
+
+
+def _semaphore(model: str) -> asyncio.Semaphore:
+    if model not in _semaphores:
+        _semaphores[model] = asyncio.Semaphore(MAX_CONCURRENCY_PER_MODEL)
+    return _semaphores[model]
+
+
+@asynccontextmanager
+async def _slot(model: str):
+    """Hold one of the model's slots; batch calls queue for a batch slot first."""
+    if not _batch_lane.get():
+        async with _semaphore(model):
+            yield
+        return
+    if model not in _batch_semaphores:
+        _batch_semaphores[model] = asyncio.Semaphore(BATCH_CONCURRENCY_PER_MODEL)
+    async with _batch_semaphores[model], _semaphore(model):
+        yield
+
+
+def _model_stats(model: str) -> dict:
+    if model not in _stats:
+        _stats[model] = {
+            "calls": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "total_wait_ms": 0.0,
+            "streams": 0,
+            "total_ttft_ms": 0.0,
+        }
+    return _stats[model]
+
+
+def _record(stats: dict, queued_at: float, started_at: float):
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    stats["in_flight"] -= 1
+    stats["calls"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    stats["total_wait_ms"] += (started_at - queued_at) * 1000
+
+
+async def chat_completion(messages: list, model: str = DEFAULT_MODEL, **kwargs) -> str:
+    """
+    Run a chat completion through the shared client and return the
+    stripped message text. Extra kwargs (temperature, ...) are passed
+    straight to Groq.
+    """
+    key = json.dumps([model, messages, kwargs], sort_keys=True, default=str)
+    return await single_flight.do(key, lambda: _chat_completion(messages, model, **kwargs))
+
+
+async def _chat_completion(messages: list, model: str, **kwargs) -> str:
+    stats = _model_stats(model)
+    queued_at = time.perf_counter()
+
+    async with _slot(model):
+        started_at = time.perf_counter()
+        stats["in_flight"] += 1
+        try:
+            with metrics.span("llm", target=model, upstream="groq"):
+                response = await get_client().chat.completions.create(
+                    model=model, messages=messages, **kwargs
+                )
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            _record(stats, queued_at, started_at)
+
+    return response.choices[0].message.content.strip()
+
+
+async def stream_chat_completion(messages: list, model: str = DEFAULT_MODEL, **kwargs):
+    """
+    Async generator yielding content deltas as the model produces them.
+    Closing the generator early (client went away) closes the upstream
+    HTTP stream, which stops the generation.
+    """
+    stats = _model_stats(model)
+    queued_at = time.perf_counter()
+
+    async with _slot(model):
+        started_at = time.perf_counter()
+        stats["in_flight"] += 1
+        stream = None
+        first_token = True
+        try:
+            with metrics.span("llm_stream", target=model, upstream="groq"):
+                stream = await get_client().chat.completions.create(
+                    model=model, messages=messages, stream=True, **kwargs
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        if first_token:
+                            first_token = False
+                            stats["streams"] += 1
+                            ttft = time.perf_counter() - started_at
+                            stats["total_ttft_ms"] += ttft * 1000
+                            metrics.stage_duration.observe(ttft, stage="llm_first_token", target=model)
+                        yield token
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            if stream is not None:
+                await stream.close()
+            _record(stats, queued_at, started_at)
+
+
+def get_stats() -> dict:
+    """Per-model call counts and timings (milliseconds)."""
+    report = {}
+    for model, s in _stats.items():
+        calls = s["calls"] or 1
+        report[model] = {
+            "calls": s["calls"],
+            "errors": s["errors"],
+            "in_flight": s["in_flight"],
+            "avg_ms": round(s["total_ms"] / calls, 2),
+            "max_ms": round(s["max_ms"], 2),
+            "avg_wait_ms": round(s["total_wait_ms"] / calls, 2),
+            "avg_first_token_ms": round(s["total_ttft_ms"] / (s["streams"] or 1), 2),
+            "concurrency_limit": MAX_CONCURRENCY_PER_MODEL,
+            "batch_concurrency_limit": BATCH_CONCURRENCY_PER_MODEL,
+        }
+    return report
+
+
+async def close():
+    """Close the pooled HTTP connections (call on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
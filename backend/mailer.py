@@ -0,0 +1,274 @@
+import ssl
+import time
+import random
+import asyncio
+import smtplib
+from dataclasses import dataclass
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from config import settings
+
+# =====================================================
+# 🔹 Queued transactional email over pooled SMTP connections
+# =====================================================
+# Handlers only enqueue; MAIL_WORKERS background workers each keep one
+# SMTP connection open (handshake + STARTTLS + login once) and send
+# whatever has queued up, up to MAIL_BATCH_SIZE messages per wake-up,
+# over it. Connections idle for SMTP_IDLE_TIMEOUT seconds are closed.
+# Temporary failures (4xx, dropped connections) are retried with
+# exponential backoff; permanent 5xx rejections are not. Host, port and
+# TLS mode are configurable so a local stand-in server can be used.
+
+SMTP_HOST = settings.smtp_host
+SMTP_PORT = settings.smtp_port
+SMTP_TLS = settings.smtp_tls  # starttls | ssl | none
+SMTP_TIMEOUT = settings.smtp_timeout
+SMTP_IDLE_TIMEOUT = settings.smtp_idle_timeout
+EMAIL_USER = settings.email_user
+EMAIL_PASS = settings.email_pass
+EMAIL_FROM = settings.email_from
+
+MAIL_WORKERS = settings.mail_workers
+MAIL_QUEUE_SIZE = settings.mail_queue_size
+MAIL_BATCH_SIZE = settings.mail_batch_size
+MAIL_MAX_ATTEMPTS = settings.mail_max_attempts
+MAIL_RETRY_BASE_DELAY = settings.mail_retry_base_delay
+MAIL_DRAIN_TIMEOUT = settings.mail_drain_timeout
+
+
+@dataclass
+class OutgoingEmail:
+    to: str
+    subject: str
+    body: str
+    attempts: int = 0
+
+
+class _Retry(Exception):
+    pass
+
+
+def build_message(email: OutgoingEmail) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = EMAIL_FROM or ""
+    msg["To"] = email.to
+    msg["Subject"] = email.subject
+    msg.attach(MIMEText(email.body, "html"))
+    return msg
+
+
+def open_connection() -> smtplib.SMTP:
+    if SMTP_TLS == "ssl":
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT,
+                                  context=ssl.create_default_context())
+    else:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_TLS == "starttls":
+            server.starttls(context=ssl.create_default_context())
+    if EMAIL_USER and EMAIL_PASS:
+        server.login(EMAIL_USER, EMAIL_PASS)
+    return server
+
+
+def _close_quietly(server: smtplib.SMTP):
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _send_one(server: smtplib.SMTP, email: OutgoingEmail):
+    try:
+        server.send_message(build_message(email))
+    except smtplib.SMTPRecipientsRefused as e:
+        codes = [code for code, _ in e.recipients.values()]
+        if any(400 <= code < 500 for code in codes):
+            raise _Retry(str(e))
+        raise
+    except smtplib.SMTPResponseException as e:
+        if 400 <= e.smtp_code < 500:
+            raise _Retry(str(e))
+        raise
+
+
+class Mailer:
+    def __init__(self, workers: int = MAIL_WORKERS, max_queue: int = MAIL_QUEUE_SIZE,
+                 batch_size: int = MAIL_BATCH_SIZE, connect=open_connection,
+                 enabled: bool = settings.mail_enabled):
+        self.enabled = enabled  # no sender address configured -> mail is skipped
+        self.workers = workers
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.connect = connect
+        self._queue = None
+        self._tasks = []
+        self._retry_tasks = set()
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.batches = 0
+        self.connections_opened = 0
+        self.max_queue_depth = 0
+        self.total_delivery_ms = 0.0
+
+    # -------- lifecycle --------
+    def start(self):
+        if self._tasks or not self.enabled:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self, timeout: float = MAIL_DRAIN_TIMEOUT):
+        """Give queued mail up to `timeout` seconds to go out, then stop the workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Mail queue not drained on shutdown ({self._queue.qsize()} left)")
+        for task in [*self._tasks, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retry_tasks, return_exceptions=True)
+        self._tasks = []
+
+    # -------- producer side --------
+    def enqueue(self, to: str, subject: str, body: str) -> bool:
+        """Queue a message for delivery; False if the queue is full or mail is disabled."""
+        if not self.enabled:
+            self.dropped += 1
+            print(f"⚠️ Email is disabled (no EMAIL_FROM/EMAIL_USER), skipped email to {to}")
+            return False
+        self.start()
+        try:
+            self._queue.put_nowait(OutgoingEmail(to, subject, body))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"⚠️ Mail queue full, dropped email to {to}")
+            return False
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def _retry_later(self, email: OutgoingEmail):
+        email.attempts += 1
+        if email.attempts >= MAIL_MAX_ATTEMPTS:
+            self.failed += 1
+            print(f"❌ Giving up on email to {email.to} after {email.attempts} attempts")
+            return
+        self.retried += 1
+        delay = MAIL_RETRY_BASE_DELAY * 2 ** (email.attempts - 1) * random.uniform(0.8, 1.2)
+
+        async def requeue():
+            await asyncio.sleep(delay)
+            try:
+                self._queue.put_nowait(email)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+        task = asyncio.create_task(requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    # -------- consumer side --------
+    def _deliver(self, server, batch: list):
+        """
+        Send a batch over one connection (runs in a thread). Returns the
+        connection to keep using (None if it broke) and the messages to retry.
+        """
+        retry = []
+        for i, email in enumerate(batch):
+            if server is None:
+                try:
+                    server = self.connect()
+                    self.connections_opened += 1
+                except (OSError, smtplib.SMTPException) as e:
+                    print(f"⚠️ SMTP connect failed: {e}")
+                    return None, retry + batch[i:]
+            try:
+                _send_one(server, email)
+                self.sent += 1
+                print(f"✅ Email sent to {email.to}")
+            except _Retry as e:
+                print(f"⚠️ Temporary failure sending to {email.to}: {e}")
+                retry.append(email)
+            except smtplib.SMTPRecipientsRefused as e:
+                self.failed += 1
+                print(f"❌ Error sending email to {email.to}: {e}")
+            except smtplib.SMTPResponseException as e:
+                # 5xx for this message only; the session itself is still fine
+                self.failed += 1
+                print(f"❌ Error sending email to {email.to}: {e}")
+            except (OSError, smtplib.SMTPException) as e:
+                print(f"⚠️ SMTP connection lost: {e}")
+                _close_quietly(server)
+                server = None
+                retry.append(email)
+            except Exception as e:
+                # Malformed message (bad address, missing sender): never retryable
+                self.failed += 1
+                print(f"❌ Error sending email to {email.to}: {e}")
+        return server, retry
+
+    async def _worker(self, index: int):
+        server = None
+        try:
+            while True:
+                try:
+                    first = await asyncio.wait_for(
+                        self._queue.get(), SMTP_IDLE_TIMEOUT if server else None
+                    )
+                except asyncio.TimeoutError:
+                    await asyncio.to_thread(_close_quietly, server)
+                    server = None
+                    continue
+
+                batch = [first]
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                self.in_flight += len(batch)
+                self.batches += 1
+                start = time.perf_counter()
+                try:
+                    server, retry = await asyncio.to_thread(self._deliver, server, batch)
+                except Exception as e:
+                    # e.g. connect() failing with something other than an SMTP
+                    # error: keep the worker alive and retry the whole batch
+                    print(f"⚠️ Mail worker {index} failed: {e!r}")
+                    server, retry = None, batch
+                finally:
+                    self.in_flight -= len(batch)
+                    self.total_delivery_ms += (time.perf_counter() - start) * 1000
+                    for _ in batch:
+                        self._queue.task_done()
+                for email in retry:
+                    self._retry_later(email)
+        finally:
+            if server is not None:
+                await asyncio.to_thread(_close_quietly, server)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": len(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting_retry": len(self._retry_tasks),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "connections_opened": self.connections_opened,
+            "avg_batch_ms": round(self.total_delivery_ms / self.batches, 1) if self.batches else 0.0,
+            "smtp": f"{SMTP_HOST}:{SMTP_PORT} ({SMTP_TLS})",
+        }
+
+
+mailer = Mailer()
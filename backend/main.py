@@ -1,25 +1,67 @@
-from dotenv import load_dotenv, find_dotenv
-load_dotenv(find_dotenv())
-
-from fastapi import FastAPI
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from config import settings  # loads .env once, before any other module reads settings
 
 # ✅ Import your routers
 from routes.auth import auth_router
 from routes.jobs import jobs_router
 from routes import resume
 from routes.tutor import tutor_router
-from routes.studentbot import get_ai_response  # <-- import the Groq LLM function
+from routes.studentbot import get_ai_response, stream_ai_response  # <-- import the Groq LLM functions
 from pydantic import BaseModel
 from routes.resume_score import resume_router
 from routes.admin_routes import admin_router
 from routes.chat_agent import chat_router
+import llm
+import pdf_text
+import pdf_render
+import http_clients
+import database
+import job_store
+import reset_tokens
+import answer_cache
+import youtube_cache
+import metrics
+from passwords import hasher
+from mailer import mailer
+from streaming import stream_tokens
 
 
 
 
 # ✅ Initialize FastAPI app
-app = FastAPI(title="AI Job Navigator API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ✅ Optional integrations without credentials are switched off, not fatal
+    for feature in settings.disabled_features():
+        print(f"⚠️ Disabled: {feature}")
+    # ✅ Open the shared outbound HTTP pool once per process
+    await http_clients.start()
+    # ✅ Start PDF render workers (styles are prebuilt once per worker)
+    pdf_render.start()
+    # ✅ Start mail workers (each keeps one SMTP connection open)
+    mailer.start()
+    # ✅ Build Mongo indexes in the background so startup never waits on Mongo
+    app.state.user_index_task = asyncio.create_task(database.init())
+    app.state.job_index_task = asyncio.create_task(job_store.init())
+    app.state.reset_token_index_task = asyncio.create_task(reset_tokens.init())
+    app.state.youtube_cache_task = asyncio.create_task(youtube_cache.init())
+    yield
+    # ✅ Flush queued mail, then release pooled connections and PDF workers
+    await mailer.stop()
+    await http_clients.close()
+    await llm.close()
+    await database.close()
+    pdf_text.shutdown()
+    pdf_render.shutdown()
+    hasher.shutdown()
+
+
+app = FastAPI(title="AI Job Navigator API", lifespan=lifespan)
 
 # ✅ Enable CORS for frontend
 app.add_middleware(
@@ -36,6 +78,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ Per-route latency histogram (route template, not raw path, keeps label counts bounded)
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Routes of included routers may not carry the router prefix; recover it from the path.
+    try:
+        rendered = route.path.format(**request.path_params)
+    except (KeyError, IndexError, ValueError):
+        return route.path
+    path = request.url.path
+    return path[: len(path) - len(rendered)] + route.path if path.endswith(rendered) else route.path
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.http_request_duration.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route_template(request),
+            status=status,
+        )
+
+
 # ✅ Register routers
 app.include_router(auth_router, prefix="/auth")
 app.include_router(jobs_router, prefix="/api")
@@ -56,9 +129,31 @@ async def ask_ai(data: Query):
     """
     Route to process user queries and return AI-generated responses.
     """
-    response = get_ai_response(data.query)
+    llm.require_enabled()
+    response = await get_ai_response(data.query)
     return {"response": response}
 
+# ✅ AI Student Bot endpoint (streamed as Server-Sent Events)
+@app.post("/api/ask/stream")
+async def ask_ai_stream(data: Query, request: Request):
+    llm.require_enabled()
+    return stream_tokens(request, stream_ai_response(data.query))
+
+# ✅ LLM gateway timings
+@app.get("/api/llm/stats")
+async def llm_stats():
+    return {"models": llm.get_stats(), "coalescing": llm.single_flight.stats()}
+
+# ✅ Answer cache hit rates for /api/ask and /api/chat
+@app.get("/api/answer_cache/stats")
+async def answer_cache_stats():
+    return answer_cache.get_stats()
+
+# ✅ Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # ✅ Home route
 @app.get("/")
 def home():
@@ -0,0 +1,159 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# =====================================================
+# 🔹 Latency histograms and counters (Prometheus text format)
+# =====================================================
+# Small in-process registry, rendered on GET /metrics:
+#   http_request_duration_seconds   per route template, method, status
+#   stage_duration_seconds          PDF parse, LLM, outbound HTTP,
+#                                   bcrypt and PDF render spans
+#   upstream_errors_total           failed calls to external services
+#   youtube_quota_units_total       YouTube Data API quota spent
+#   cache_requests_total            hits/misses read from the caches
+# Observations may come from executor threads, so updates take a lock.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+_caches = {}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, series in items:
+            labels = dict(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(float(bound))})} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(float(series[-2]))}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+
+# =====================================================
+# 🔹 App metrics
+# =====================================================
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce the response headers, by route template.",
+    ("method", "route", "status"),
+)
+stage_duration = Histogram(
+    "stage_duration_seconds",
+    "Time spent in one processing stage of a request.",
+    ("stage", "target"),
+)
+upstream_errors = Counter(
+    "upstream_errors_total",
+    "Failed calls to external services (exceptions and HTTP >= 400).",
+    ("upstream",),
+)
+youtube_quota_units = Counter(
+    "youtube_quota_units_total",
+    "YouTube Data API quota units spent by this process.",
+)
+
+
+@contextmanager
+def span(stage: str, target: str = "", upstream: str = None):
+    """
+    Time a block as one stage. If `upstream` is given, an exception
+    inside the block also counts as an error for that upstream.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if upstream:
+            upstream_errors.inc(upstream=upstream)
+        raise
+    finally:
+        stage_duration.observe(time.perf_counter() - start, stage=stage, target=target)
+
+
+def register_cache(name: str, cache):
+    """Expose a cache's hits/misses (and stale hits) as cache_requests_total."""
+    _caches[name] = cache
+
+
+def _render_caches() -> list:
+    name = "cache_requests_total"
+    lines = [f"# HELP {name} Cache lookups by result.", f"# TYPE {name} counter"]
+    for cache_name, cache in sorted(_caches.items()):
+        for result, attr in (("hit", "hits"), ("stale", "stale_hits"), ("fallback", "fallback_hits"), ("miss", "misses")):
+            if hasattr(cache, attr):
+                lines.append(f"{name}{_format_labels({'cache': cache_name, 'result': result})} {getattr(cache, attr)}")
+    return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    lines.extend(_render_caches())
+    return "\n".join(lines) + "\n"
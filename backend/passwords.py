@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from config import settings
+import metrics
+
+# =====================================================
+# 🔹 Password hashing off the event loop
+# =====================================================
+# bcrypt costs 100-300 ms of CPU per call. It releases the GIL, so a
+# small dedicated thread pool runs hashes in parallel while the event
+# loop keeps serving requests. Work beyond PASSWORD_HASH_MAX_QUEUE
+# waiting calls is rejected with 503 instead of piling up.
+
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_MAX_QUEUE = settings.password_hash_max_queue
+
+# min/max rounds pinned to the configured cost, so any stored hash with
+# a different cost is reported by verify_and_update and rehashed.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+                 context: CryptContext = pwd_context):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.context = context
+        self._executor = None
+        self.pending = 0        # submitted, not yet finished
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, op: str, fn, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry.",
+                                headers={"Retry-After": "1"})
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            with metrics.span("bcrypt", target=op):
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str):
+        """
+        Return (valid, new_hash). new_hash is set when the stored hash
+        uses outdated parameters and should be saved in its place.
+        """
+        valid, new_hash = await self._run("verify", self.context.verify_and_update, password, hashed)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(self.pending - self.workers, 0),
+            "max_pending": self.max_pending,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher()
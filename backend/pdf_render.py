@@ -0,0 +1,173 @@
+import io
+from functools import lru_cache
+from fastapi import HTTPException
+from config import settings
+import metrics
+from process_pool import WorkerPool, WorkerCrashed
+
+# =====================================================
+# 🔹 Resume PDF rendering (off the event loop, in memory)
+# =====================================================
+# ReportLab layout is CPU-bound, so it runs in a process pool. ReportLab
+# is imported and the theme and paragraph styles are built once per
+# worker process (not in the API process), and PDFs are rendered into a
+# BytesIO buffer instead of the temp dir.
+RENDER_WORKERS = settings.pdf_render_workers
+
+
+@lru_cache(maxsize=1)
+def _theme() -> dict:
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    # 🎨 Light Canva Theme
+    header_bg = colors.HexColor("#E3F2FD")       # Light pastel blue
+    accent_color = colors.HexColor("#1976D2")    # Medium blue for text
+
+    return {
+        "accent_color": accent_color,
+        "name": ParagraphStyle(
+            "NameStyle",
+            fontSize=20,
+            leading=24,
+            textColor=accent_color,
+            alignment=1,
+            spaceAfter=4,
+        ),
+        "contact": ParagraphStyle(
+            "ContactStyle",
+            fontSize=10.5,
+            textColor=colors.HexColor("#37474F"),
+            alignment=1,
+        ),
+        "section_title": ParagraphStyle(
+            "SectionTitle",
+            fontSize=13,
+            textColor=accent_color,
+            backColor=header_bg,
+            leftIndent=4,
+            spaceBefore=12,
+            spaceAfter=6,
+            leading=15,
+        ),
+        "text": ParagraphStyle(
+            "TextStyle",
+            fontSize=10.5,
+            leading=15,
+            textColor=colors.HexColor("#212121"),
+        ),
+        "bullet": ParagraphStyle(
+            "BulletStyle",
+            fontSize=10.5,
+            leading=15,
+            leftIndent=15,
+            bulletIndent=5,
+            textColor=colors.HexColor("#424242"),
+        ),
+        "header_table": TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), header_bg),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+        ]),
+    }
+
+
+SKIP_KEYWORDS = ["name", "email", "phone", "contact", "resume", "applying as"]
+SECTION_KEYWORDS = {
+    "summary": "🧠 PROFESSIONAL SUMMARY",
+    "skill": "💻 TECHNICAL SKILLS",
+    "education": "🎓 EDUCATION",
+    "project": "🚀 PROJECTS",
+    "certification": "🏅 CERTIFICATIONS",
+    "experience": "💼 EXPERIENCE",
+    "highlight": "🌟 ADDITIONAL HIGHLIGHTS",
+}
+
+def render_resume_pdf(name: str, email: str, phone: str, resume_text: str) -> bytes:
+    """Lay out the generated resume text and return the PDF bytes."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table
+
+    theme = _theme()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        leftMargin=0.8 * inch,
+        rightMargin=0.8 * inch,
+        topMargin=0.8 * inch,
+        bottomMargin=0.8 * inch,
+    )
+    elements = []
+
+    # 🩵 Header (Name + Contact)
+    header_table = Table(
+        [
+            [Paragraph(f"<b>{name}</b>", theme["name"])],
+            [Paragraph(f"{email}   |   {phone}", theme["contact"])],
+        ],
+        colWidths=[6.2 * inch],
+    )
+    header_table.setStyle(theme["header_table"])
+    elements.append(header_table)
+    elements.append(Spacer(1, 14))
+
+    # 🧩 Parse AI Resume Text (Prevent repetition)
+    seen_sections = set()
+    for line in resume_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        lower = line.lower()
+        if any(key in lower for key in SKIP_KEYWORDS):
+            continue
+
+        matched_section = next((k for k in SECTION_KEYWORDS if k in lower), None)
+        if matched_section and matched_section not in seen_sections:
+            seen_sections.add(matched_section)
+            elements.append(Paragraph(SECTION_KEYWORDS[matched_section], theme["section_title"]))
+            continue
+
+        if line.startswith("-"):
+            elements.append(Paragraph(line[1:].strip(), theme["bullet"]))
+        else:
+            elements.append(Paragraph(line, theme["text"]))
+
+    # ✨ Soft divider at the end
+    elements.append(Spacer(1, 12))
+    elements.append(HRFlowable(width="100%", thickness=0.8, color=theme["accent_color"]))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def _init_worker():
+    # Import ReportLab and build the styles once per worker, before the first render.
+    _theme()
+
+
+_pool = WorkerPool("PDF render", RENDER_WORKERS, initializer=_init_worker)
+
+
+def start():
+    """Spin up the render workers at startup so the first request doesn't pay for it."""
+    executor = _pool.get()
+    for _ in range(RENDER_WORKERS):
+        executor.submit(_init_worker)
+
+
+async def render_resume(name: str, email: str, phone: str, resume_text: str) -> bytes:
+    """Render in a worker process; a crashed pool is rebuilt, a second crash is a 503."""
+    with metrics.span("pdf_render"):
+        try:
+            return await _pool.run(render_resume_pdf, name, email, phone, resume_text)
+        except WorkerCrashed:
+            raise HTTPException(status_code=503, detail="PDF rendering is temporarily unavailable, please retry.")
+
+
+def shutdown():
+    _pool.shutdown()
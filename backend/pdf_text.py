@@ -0,0 +1,128 @@
+import os
+import asyncio
+import hashlib
+from config import settings
+from cache import TTLCache
+import metrics
+from process_pool import WorkerPool, WorkerCrashed
+
+# =====================================================
+# 🔹 Content-addressed resume text extraction
+# =====================================================
+# Resumes are keyed by the SHA-256 of their bytes, so re-uploading the
+# same file (new filters, re-scoring, ...) skips PDF parsing entirely.
+# Lookup order: in-memory LRU -> optional disk tier -> process pool.
+# PyMuPDF is only imported inside the workers that actually parse.
+
+CACHE_SIZE = settings.pdf_text_cache_size
+CACHE_DIR = settings.pdf_text_cache_dir  # unset = memory only
+PARSE_WORKERS = settings.pdf_parse_workers
+
+_memory = TTLCache(maxsize=CACHE_SIZE)
+metrics.register_cache("pdf_text", _memory)
+_pool = WorkerPool("PDF parse", PARSE_WORKERS)
+
+
+class PageLimitExceeded(ValueError):
+    pass
+
+
+class UnreadablePdf(ValueError):
+    """MuPDF could not parse the file (corrupt or truncated body)."""
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_pdf(source, max_pages: int = None) -> str:
+    """
+    Extract plain text from PDF bytes or a file path (runs inside a
+    worker process). Passing a path lets MuPDF read the file directly
+    instead of pickling the bytes across the process boundary.
+    """
+    import pymupdf
+
+    # MuPDF errors (FileDataError etc.) are RuntimeErrors whose message can
+    # include the temp file path, so only a generic error leaves the worker.
+    try:
+        if isinstance(source, str):
+            pdf = pymupdf.open(source, filetype="pdf")
+        else:
+            pdf = pymupdf.open(stream=source, filetype="pdf")
+        with pdf:
+            if max_pages and pdf.page_count > max_pages:
+                raise PageLimitExceeded(f"PDF has {pdf.page_count} pages (max {max_pages}).")
+            text = "".join(page.get_text("text") for page in pdf)
+            # A truncated body is often "repaired" into empty pages instead of
+            # raising; keep repaired files only if they still yield text.
+            if pdf.is_repaired and not text.strip():
+                raise UnreadablePdf("Could not read PDF")
+            return text
+    except RuntimeError:
+        raise UnreadablePdf("Could not read PDF") from None
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.txt")
+
+
+def _read_disk(key: str):
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(_disk_path(key), "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_disk(key: str, text: str):
+    if not CACHE_DIR:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{_disk_path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, _disk_path(key))
+    except OSError as e:
+        print(f"⚠️ PDF text cache write failed: {e}")
+
+
+async def _extract(key: str, source, max_pages: int = None) -> str:
+    text = _memory.get(key)
+    if text is not None:
+        return text
+
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(None, _read_disk, key)
+    if text is None:
+        with metrics.span("pdf_parse"):
+            try:
+                text = await _pool.run(parse_pdf, source, max_pages)
+            except WorkerCrashed:
+                # The same file took down two fresh workers: treat it as hostile
+                raise UnreadablePdf("Could not read PDF") from None
+        await loop.run_in_executor(None, _write_disk, key, text)
+
+    _memory.set(key, text)
+    return text
+
+
+async def extract_pdf_text(data: bytes, max_pages: int = None) -> str:
+    """Return the text of a PDF, parsing it off the event loop only on a cache miss."""
+    return await _extract(fingerprint(data), data, max_pages)
+
+
+async def extract_pdf_file_text(path: str, sha256: str, max_pages: int = None) -> str:
+    """Same as extract_pdf_text for a PDF on disk whose hash is already known."""
+    return await _extract(sha256, path, max_pages)
+
+
+def get_stats() -> dict:
+    return {**_memory.stats(), "disk_tier": bool(CACHE_DIR), "worker_restarts": _pool.restarts}
+
+
+def shutdown():
+    _pool.shutdown()
@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# =====================================================
+# 🔹 Self-healing process pools for CPU-bound work
+# =====================================================
+# A ProcessPoolExecutor whose worker dies (segfault in a C library, OOM
+# kill) is broken for good: every later submit raises BrokenProcessPool.
+# WorkerPool creates the executor lazily, throws a broken one away and
+# retries the call once on a fresh pool. A second crash raises
+# WorkerCrashed so callers can answer 400/503 instead of a bare 500.
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class WorkerPool:
+    def __init__(self, name: str, max_workers: int, initializer=None):
+        self.name = name
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.restarts = 0
+        self._executor = None
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        # Concurrent callers all see the same crash; only the first one
+        # replaces the pool, the rest must not shut down its successor.
+        if self._executor is executor:
+            self._executor = None
+            self.restarts += 1
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        """`await fn(*args)` in a worker process, rebuilding the pool once if it broke."""
+        loop = asyncio.get_running_loop()
+        for attempt in (1, 2):
+            executor = self.get()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                if attempt == 2:
+                    raise WorkerCrashed(f"{self.name} worker crashed twice") from None
+                print(f"⚠️ {self.name} worker pool broke, restarting it")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
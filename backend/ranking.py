@@ -0,0 +1,94 @@
+from collections import Counter
+
+# =====================================================
+# 🔹 Local job ranking (BM25F)
+# =====================================================
+# Each title and description is tokenized once and tallied into a
+# Counter (plus n-grams for multi-word skills), so every skill is a dict
+# lookup instead of a scan of the text.
+# BM25 is then computed over the whole (jobs x skills) matrix with
+# NumPy. Title hits weigh more than description hits. NumPy is imported
+# on the first ranking, not when the API process starts.
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3.0
+
+# Keep "+", "#" and "." so C++, C# and Node.js survive tokenization.
+_PUNCTUATION = str.maketrans({c: " " for c in "!\"$%&'()*,/:;<=>?@[\\]^`{|}~-_"})
+
+
+def _tokens(text: str) -> list:
+    return (text or "").lower().translate(_PUNCTUATION).replace(". ", " ").rstrip(".").split()
+
+
+def _term_counts(texts: list, phrases: list):
+    """(len(texts) x len(phrases)) matrix of phrase counts plus token lengths."""
+    import numpy as np
+
+    # Single words are tallied by Counter(tokens); multi-word phrases only
+    # build n-grams at positions whose token can start one.
+    keys = [p[0] if len(p) == 1 else p for p in phrases]
+    sizes = sorted({len(p) for p in phrases if len(p) > 1})
+    starts = {p[0] for p in phrases if len(p) > 1}
+    counts = np.zeros((len(texts), len(phrases)), dtype=np.float32)
+    lengths = np.zeros(len(texts), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _tokens(text)
+        lengths[row] = len(tokens)
+        tally = Counter(tokens)
+        if starts:
+            tally.update(
+                tuple(tokens[i:i + n])
+                for i, token in enumerate(tokens) if token in starts
+                for n in sizes
+            )
+        counts[row] = [tally[key] for key in keys]
+    return counts, lengths
+
+
+def rank_jobs(skills: list, jobs: list) -> list:
+    """
+    Return copies of `jobs` sorted by relevance to `skills`, each with
+    `match_score` (0-100, relative to the best job) and `matched_skills`.
+    """
+    import numpy as np
+
+    if not jobs:
+        return []
+
+    phrases, names = [], []
+    for skill in skills:
+        phrase = tuple(_tokens(skill))
+        if phrase and phrase not in phrases:
+            phrases.append(phrase)
+            names.append(skill)
+    if not phrases:
+        return [dict(job, match_score=0.0, matched_skills=[]) for job in jobs]
+
+    title_tf, title_len = _term_counts([j.get("job_title") for j in jobs], phrases)
+    desc_tf, desc_len = _term_counts([j.get("description") for j in jobs], phrases)
+
+    tf = TITLE_WEIGHT * title_tf + desc_tf
+    doc_len = TITLE_WEIGHT * title_len + desc_len
+    avg_len = max(float(doc_len.mean()), 1.0)
+
+    n_jobs = len(jobs)
+    doc_freq = (tf > 0).sum(axis=0)
+    idf = np.log1p((n_jobs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    norm = K1 * (1 - B + B * doc_len / avg_len)
+    scores = (idf * tf * (K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+    best = float(scores.max())
+    scaled = scores / best * 100 if best > 0 else scores
+    order = np.argsort(-scores, kind="stable")
+    matched = tf > 0
+
+    return [
+        dict(
+            jobs[i],
+            match_score=round(float(scaled[i]), 2),
+            matched_skills=[names[k] for k in np.flatnonzero(matched[i])],
+        )
+        for i in order
+    ]
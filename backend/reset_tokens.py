@@ -0,0 +1,86 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from config import settings
+from cache import TTLCache
+import metrics
+from database import reset_tokens_collection
+
+# =====================================================
+# 🔹 Password reset tokens (reset_tokens_collection)
+# =====================================================
+# One document per user (_id = email) holds the SHA-256 of that user's
+# current token, so issuing is a single upsert: concurrent requests for
+# the same user leave exactly one valid token (the last one written).
+# Lookups use a unique index on token_hash, and a database leak exposes
+# no usable links. A TTL index expires old tokens, and reads also check the age
+# themselves because Mongo's TTL sweep runs only once a minute. Each
+# worker keeps recently issued/seen tokens in memory to answer lookups
+# without a round trip; redeeming a token is always an atomic
+# find_one_and_delete, so it works exactly once across all workers.
+
+RESET_TOKEN_TTL = settings.reset_token_ttl
+RESET_TOKEN_CACHE_SIZE = settings.reset_token_cache_size
+
+_memory = TTLCache(maxsize=RESET_TOKEN_CACHE_SIZE, ttl=RESET_TOKEN_TTL)
+metrics.register_cache("reset_tokens", _memory)
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _oldest_valid() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=RESET_TOKEN_TTL)
+
+
+async def ensure_indexes():
+    await reset_tokens_collection.create_index("created_at", expireAfterSeconds=RESET_TOKEN_TTL)
+    # sparse: documents written before token_hash existed have no value
+    await reset_tokens_collection.create_index("token_hash", unique=True, sparse=True)
+
+
+async def init():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not ensure reset token indexes: {e}")
+
+
+async def issue_token(email: str) -> str:
+    """Create a reset token for email, replacing any earlier one atomically."""
+    token = secrets.token_urlsafe(32)
+    key = hash_token(token)
+    await reset_tokens_collection.update_one(
+        {"_id": email},
+        {"$set": {"token_hash": key, "created_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    _memory.set(key, email)
+    return token
+
+
+async def lookup_token(token: str):
+    """Email the token belongs to, or None if it is unknown or expired."""
+    key = hash_token(token)
+    email = _memory.get(key)
+    if email is not None:
+        return email
+    doc = await reset_tokens_collection.find_one(
+        {"token_hash": key, "created_at": {"$gt": _oldest_valid()}}, {"_id": 1}
+    )
+    if doc is None:
+        return None
+    _memory.set(key, doc["_id"])
+    return doc["_id"]
+
+
+async def redeem_token(token: str):
+    """Atomically consume the token; returns its email only for the first caller."""
+    key = hash_token(token)
+    _memory.pop(key)
+    doc = await reset_tokens_collection.find_one_and_delete(
+        {"token_hash": key, "created_at": {"$gt": _oldest_valid()}}, projection={"_id": 1}
+    )
+    return doc["_id"] if doc else None
+
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from database import get_all_users, users_collection
-from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from database import list_users, iter_users, delete_user as delete_user_record, USERS_PAGE_SIZE, USERS_PAGE_MAX
+from streaming import ndjson_line
 
 admin_router = APIRouter()
 
@@ -19,13 +19,38 @@ async def admin_login(data: dict):
     raise HTTPException(status_code=401, detail="Invalid admin credentials")
 
 @admin_router.get("/admin/users")
-async def get_users():
-    users = get_all_users()
-    return JSONResponse({"users": users})
+async def get_users(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(USERS_PAGE_SIZE, ge=1, le=USERS_PAGE_MAX),
+    search: str = Query(None, description="Case-insensitive match on name or email"),
+    sort: str = Query("signup_date", pattern="^(signup_date|name|email)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    try:
+        page = await list_users(limit=limit, cursor=cursor, search=search, sort=sort, order=order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(page)
+
+@admin_router.get("/admin/users/export")
+async def export_users(
+    search: str = Query(None, description="Case-insensitive match on name or email"),
+    sort: str = Query("signup_date", pattern="^(signup_date|name|email)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    """Every matching user as NDJSON, streamed straight from the Mongo cursor."""
+    async def lines():
+        async for user in iter_users(search=search, sort=sort, order=order):
+            yield ndjson_line(user)
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'},
+    )
 
 @admin_router.delete("/admin/delete_user/{user_id}")
 async def delete_user(user_id: str):
-    result = users_collection.delete_one({"_id": ObjectId(user_id)})
-    if result.deleted_count == 1:
+    if await delete_user_record(user_id):
         return {"message": "User deleted successfully"}
     raise HTTPException(status_code=404, detail="User not found")
@@ -1,20 +1,19 @@
-from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
-from passlib.context import CryptContext
 from datetime import datetime
-from bson import ObjectId
-from database import users_collection
-from routes.email_utils import send_email  # ✅ Email sender (SMTP)
+from database import (
+    find_user_by_email, user_exists, create_user, update_password, list_users as list_users_page,
+    USER_AUTH_FIELDS, USERS_PAGE_SIZE, USERS_PAGE_MAX
+)
+from routes.email_utils import send_email  # ✅ Queued email sender (pooled SMTP)
+from mailer import mailer
+from passwords import hasher  # ✅ bcrypt in a bounded thread pool
+from reset_tokens import issue_token, lookup_token, redeem_token  # ✅ hashed, expiring, shared across workers
 from pydantic import BaseModel
-import secrets
-import os   
+from config import settings
 # ---------------- CONFIG ----------------
 auth_router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
-
-# Temporary in-memory store for password reset tokens
-reset_tokens = {}
+FRONTEND_URL = settings.frontend_url
 
 # ---------------- MODELS ----------------
 class ForgotPasswordRequest(BaseModel):
@@ -27,7 +26,7 @@ class ResetPasswordRequest(BaseModel):
 
 # ---------------- SIGNUP ----------------
 @auth_router.post("/signup")
-async def signup(request: Request, background_tasks: BackgroundTasks):
+async def signup(request: Request):
     data = await request.json()
     name = data.get("name")
     email = data.get("email")
@@ -36,11 +35,10 @@ async def signup(request: Request, background_tasks: BackgroundTasks):
     if not all([name, email, password]):
         raise HTTPException(status_code=400, detail="All fields are required.")
 
-    existing_user = users_collection.find_one({"email": email})
-    if existing_user:
+    if await user_exists(email):
         raise HTTPException(status_code=400, detail="User already exists.")
 
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await hasher.hash(password)
     user_data = {
         "name": name,
         "email": email,
@@ -48,7 +46,9 @@ async def signup(request: Request, background_tasks: BackgroundTasks):
         "signup_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     }
 
-    users_collection.insert_one(user_data)
+    # Unique email index: a concurrent signup for the same email loses here
+    if not await create_user(user_data):
+        raise HTTPException(status_code=400, detail="User already exists.")
 
     # ✅ Prepare welcome email
     subject = "🎉 Welcome to AI Job Navigator!"
@@ -66,8 +66,8 @@ async def signup(request: Request, background_tasks: BackgroundTasks):
     <p>Best regards,<br><b>The AI Job Navigator Team</b></p>
     """
 
-    # ✅ Send email in background (non-blocking)
-    background_tasks.add_task(send_email, email, subject, body)
+    # ✅ Queue email for the background mail workers (non-blocking)
+    send_email(email, subject, body)
 
     return JSONResponse({"message": "✅ User registered successfully! Welcome email will arrive shortly."})
 
@@ -82,43 +82,62 @@ async def login(request: Request):
     if not all([email, password]):
         raise HTTPException(status_code=400, detail="Email and password required.")
 
-    user = users_collection.find_one({"email": email})
+    user = await find_user_by_email(email, USER_AUTH_FIELDS)
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    if not pwd_context.verify(password, user["password"]):
+    valid, new_hash = await hasher.verify(password, user["password"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials.")
 
+    # Stored hash used old cost settings: replace it transparently
+    if new_hash:
+        await update_password({"_id": user["_id"]}, new_hash)
+
     return JSONResponse({
         "message": "✅ Login successful!",
         "user": {"name": user["name"], "email": user["email"]}
     })
 
 
+# ---------------- PASSWORD HASHER STATS ----------------
+@auth_router.get("/hash_stats")
+async def hash_stats():
+    return hasher.stats()
+
+
+# ---------------- MAIL QUEUE STATS ----------------
+@auth_router.get("/mail_stats")
+async def mail_stats():
+    return mailer.stats()
+
+
 # ---------------- ADMIN: VIEW USERS ----------------
 @auth_router.get("/users")
-async def list_users():
-    users = []
-    for user in users_collection.find():
-        users.append({
-            "id": str(user["_id"]),
-            "name": user["name"],
-            "email": user["email"],
-            "signup_date": user.get("signup_date", "")
-        })
-    return {"users": users}
+async def list_users(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(USERS_PAGE_SIZE, ge=1, le=USERS_PAGE_MAX),
+    search: str = Query(None, description="Case-insensitive match on name or email"),
+    sort: str = Query("signup_date", pattern="^(signup_date|name|email)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    try:
+        return await list_users_page(limit=limit, cursor=cursor, search=search, sort=sort, order=order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ---------------- FORGOT PASSWORD ----------------
 @auth_router.post("/forgot-password")
-async def forgot_password(data: ForgotPasswordRequest, background_tasks: BackgroundTasks):
-    user = users_collection.find_one({"email": data.email})
+async def forgot_password(data: ForgotPasswordRequest):
+    if not settings.mail_enabled:
+        raise HTTPException(status_code=503, detail="Password reset by email is disabled on this server.")
+    user = await find_user_by_email(data.email, {"name": 1})
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
     # Generate secure reset token
-    token = secrets.token_urlsafe(32)
-    reset_tokens[data.email] = token
+    token = await issue_token(data.email)
 
     # Reset link for frontend
     reset_link = f"{FRONTEND_URL}/reset-password?token={token}"
@@ -136,8 +155,8 @@ async def forgot_password(data: ForgotPasswordRequest, background_tasks: Backgro
     <p>Best regards,<br><b>AI Job Navigator Team</b></p>
     """
 
-    # ✅ Send reset email in background
-    background_tasks.add_task(send_email, data.email, subject, body)
+    # ✅ Queue reset email for the background mail workers
+    send_email(data.email, subject, body)
 
     return {"message": "✅ Password reset link sent successfully!"}
 
@@ -147,35 +166,29 @@ async def forgot_password(data: ForgotPasswordRequest, background_tasks: Backgro
 async def reset_password(request: Request):
     try:
         data = await request.json()
-        print("📩 Received reset-password data:", data)
-
-        token = data.get("token")
-        new_password = data.get("new_password")
-
-        if not token or not new_password:
-            raise HTTPException(status_code=400, detail="Token and new password required.")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body.")
 
-        # Find email associated with the token
-        email = next((email for email, t in reset_tokens.items() if t == token), None)
-        if not email:
-            raise HTTPException(status_code=400, detail="Invalid or expired token.")
+    token = data.get("token") if isinstance(data, dict) else None
+    new_password = data.get("new_password") if isinstance(data, dict) else None
+    if not token or not new_password:
+        raise HTTPException(status_code=400, detail="Token and new password required.")
 
-        # Hash new password and update
-        hashed_password = pwd_context.hash(new_password)
-        result = users_collection.update_one(
-            {"email": email},
-            {"$set": {"password": hashed_password}}
-        )
+    # Find email associated with the token
+    email = await lookup_token(token)
+    if not email:
+        raise HTTPException(status_code=400, detail="Invalid or expired token.")
 
-        if result.modified_count == 0:
-            raise HTTPException(status_code=500, detail="Password update failed.")
+    # Hash new password, then claim the token (only one request can).
+    # Hasher (503 when saturated) and database errors propagate as-is.
+    hashed_password = await hasher.hash(new_password)
+    if not await redeem_token(token):
+        raise HTTPException(status_code=400, detail="Invalid or expired token.")
+    modified = await update_password({"email": email}, hashed_password)
 
-        # Remove used token
-        del reset_tokens[email]
-        print(f"✅ Password updated for {email}")
+    if modified == 0:
+        raise HTTPException(status_code=500, detail="Password update failed.")
 
-        return JSONResponse({"message": "✅ Password reset successful!"})
+    print(f"✅ Password updated for {email}")
 
-    except Exception as e:
-        print("⚠️ Error in reset-password route:", e)
-        raise HTTPException(status_code=400, detail=f"Error: {str(e)}")
+    return JSONResponse({"message": "✅ Password reset successful!"})
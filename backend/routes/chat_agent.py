@@ -1,29 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-import os
-from groq import Groq
-from dotenv import load_dotenv
-
-load_dotenv() 
+from llm import chat_completion, stream_chat_completion, require_enabled
+from streaming import stream_tokens
+import answer_cache
 
 chat_router = APIRouter()
 
-# ✅ Initialize Groq client using your API key from environment
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
 class ChatRequest(BaseModel):
     message: str
 
-@chat_router.post("/chat")
-async def chat_with_agent(data: ChatRequest):
-    """
-    AI-powered customer support using Groq LLM.
-    Responds to queries related to the AI Job Navigator website.
-    """
-    try:
-        prompt = f"""
+
+def build_chat_messages(message: str) -> list:
+    prompt = f"""
         You are an AI support assistant for the website 'AI Job Navigator'.
-        The user is asking: {data.message}
+        The user is asking: {message}
 
         The website offers:
         - AI Tutor for learning and interview preparation.
@@ -34,17 +24,37 @@ async def chat_with_agent(data: ChatRequest):
         Respond clearly and politely to help the user with website-related questions.
         Keep responses short (2–3 sentences) and easy to understand.
         """
+    return [
+        {"role": "system", "content": "You are a helpful website assistant."},
+        {"role": "user", "content": prompt},
+    ]
+
 
-        completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You are a helpful website assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            model="llama-3.3-70b-versatile",  # Groq LLM
-        )
+@chat_router.post("/chat")
+async def chat_with_agent(data: ChatRequest):
+    """
+    AI-powered customer support using Groq LLM.
+    Responds to queries related to the AI Job Navigator website.
+    """
+    require_enabled()
+    cached = answer_cache.get_answer("chat", data.message)
+    if cached is not None:
+        return {"response": cached}
 
-        reply = completion.choices[0].message.content.strip()
+    try:
+        reply = await chat_completion(build_chat_messages(data.message))
+        answer_cache.store_answer("chat", data.message, reply)
         return {"response": reply}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error communicating with Groq API: {str(e)}")
+
+
+@chat_router.post("/chat/stream")
+async def chat_with_agent_stream(data: ChatRequest, request: Request):
+    """
+    Same as /chat, but streams the reply token by token as Server-Sent Events.
+    """
+    require_enabled()
+    tokens = stream_chat_completion(build_chat_messages(data.message))
+    return stream_tokens(request, answer_cache.cached_stream("chat", data.message, tokens))
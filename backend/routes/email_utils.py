@@ -1,29 +1,6 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import os
-from dotenv import load_dotenv
+from mailer import mailer
 
-load_dotenv()
-
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USER = os.getenv("EMAIL_USER")
-EMAIL_PASS = os.getenv("EMAIL_PASS")
 
 def send_email(to_email, subject, body):
-    msg = MIMEMultipart()
-    msg["From"] = EMAIL_USER
-    msg["To"] = to_email
-    msg["Subject"] = subject
-
-    msg.attach(MIMEText(body, "html"))
-
-    try:
-        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_USER, EMAIL_PASS)
-            server.send_message(msg)
-        print(f"✅ Email sent to {to_email}")
-    except Exception as e:
-        print(f"❌ Error sending email: {e}")
+    """Queue an HTML email; delivery happens on the mailer's pooled SMTP workers."""
+    return mailer.enqueue(to_email, subject, body)
@@ -1,39 +1,55 @@
-import os
+import re
 import json
-import tempfile
 import asyncio
-import aiohttp
 from fastapi import APIRouter, UploadFile, HTTPException, Query
-from PyPDF2 import PdfReader
-from groq import Groq
-from dotenv import load_dotenv
+from config import settings
+from llm import chat_completion
+import http_clients
+from uploads import ingest_pdf
+import skill_cache
+from skill_extractor import extract_skills_locally, canonicalize_skills
+from cache import StaleWhileRevalidateCache
+from singleflight import SingleFlight
+from ranking import rank_jobs
+import job_store
+import metrics
 
 # =====================================================
 # 🔹 Environment Setup
 # =====================================================
-load_dotenv()
-
 jobs_router = APIRouter()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
-RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
+# Base URLs are overridable so load tests can point at local stand-ins.
+# A source whose key is missing is skipped; with none configured the
+# endpoint answers from the local job store only.
+JSEARCH_URL = settings.jsearch_url
+GOOGLE_SEARCH_URL = settings.google_search_url
+RAPIDAPI_KEY = settings.rapidapi_key
 RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GOOGLE_CX_ID = os.getenv("GOOGLE_CX_ID")
+GOOGLE_API_KEY = settings.google_api_key
+GOOGLE_CX_ID = settings.google_cx_id
 
-required_env = ["GROQ_API_KEY", "RAPIDAPI_KEY", "GOOGLE_API_KEY", "GOOGLE_CX_ID"]
-missing = [v for v in required_env if not os.getenv(v)]
-if missing:
-    raise RuntimeError(f"❌ Missing environment variables: {', '.join(missing)}")
+# Search results are shared across users for the same normalized query;
+# stale entries are served while a background refresh runs.
+JOB_CACHE_TTL = settings.job_cache_ttl
+JOB_CACHE_STALE_TTL = settings.job_cache_stale_ttl
+JOB_CACHE_SIZE = settings.job_cache_size
 
+# Only the best local matches are sent to the LLM when re-ranking.
+RERANK_TOP_K = settings.rerank_top_k
 
-# =====================================================
-# 🔹 Helper: Extract text from resume
-# =====================================================
-def extract_resume_text(file_path: str) -> str:
-    reader = PdfReader(file_path)
-    return "".join([page.extract_text() or "" for page in reader.pages])
+# In local-first mode, fewer stored matches than this triggers the
+# external job search fan-out.
+LOCAL_MIN_RESULTS = settings.local_min_results
+
+job_search_caches = {
+    source: StaleWhileRevalidateCache(JOB_CACHE_TTL, JOB_CACHE_STALE_TTL, maxsize=JOB_CACHE_SIZE)
+    for source in ("JSearch", "Google")
+}
+for source, cache in job_search_caches.items():
+    metrics.register_cache(f"job_search_{source.lower()}", cache)
+# Concurrent misses for the same query share one upstream request.
+job_search_flights = SingleFlight()
 
 
 # =====================================================
@@ -47,50 +63,96 @@ async def extract_skills_with_llm(resume_text: str):
     {resume_text[:4000]}
     """
 
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
+    text = await chat_completion(
+        [
             {"role": "system", "content": "You are an AI that extracts and identifies skills accurately."},
             {"role": "user", "content": prompt},
         ],
         temperature=0.2,
     )
-
-    text = response.choices[0].message.content.strip()
     try:
         return json.loads(text)
     except:
         return [s.strip() for s in text.replace("\n", ",").split(",") if s.strip()]
 
 
+async def get_resume_skills(resume_text: str):
+    """
+    Canonical skills for a resume, memoized by resume fingerprint.
+    The local taxonomy matcher answers first; the LLM is only asked when
+    it finds too few skills (and is configured), and its answer is merged
+    in canonical form.
+    """
+    key = skill_cache.resume_key(resume_text)
+    skills = await skill_cache.get_cached_skills(key)
+    if skills is None:
+        skills, confident = extract_skills_locally(resume_text)
+        if not confident and settings.llm_enabled:
+            try:
+                llm_skills = await extract_skills_with_llm(resume_text)
+            except Exception as e:
+                # Optional enrichment only: keep (and cache) the local skills
+                print(f"⚠️ LLM skill extraction failed, using local skills: {e!r}")
+                llm_skills = None
+            if isinstance(llm_skills, list):
+                skills = canonicalize_skills(skills + llm_skills)
+        if skills:
+            await skill_cache.cache_skills(key, skills)
+    return skills
+
+
+def query_skills(skills: list, limit: int = 3) -> str:
+    """Top canonical skills joined for a search query."""
+    return ", ".join(canonicalize_skills(skills)[:limit])
+
+
 # =====================================================
-# 🔹 Helper: LLM-based job ranking
+# 🔹 Helper: LLM-based job re-ranking (optional, top-k only)
 # =====================================================
 async def rank_jobs_with_llm(skills: list, jobs: list):
-    job_text = json.dumps(jobs[:10], indent=2)
+    """
+    Reorder `jobs` by LLM relevance. The model answers with indices into
+    the candidate list; invalid and repeated indices are dropped and any
+    candidate it left out keeps its local order at the end, so the result
+    is always a permutation of `jobs`.
+    """
+    candidates = [
+        {
+            "index": i,
+            "job_title": j.get("job_title"),
+            "company_name": j.get("company_name"),
+            "description": (j.get("description") or "")[:300],
+        }
+        for i, j in enumerate(jobs)
+    ]
     prompt = f"""
     Given these skills: {', '.join(skills)},
     rank the following jobs from most to least relevant.
-    Output JSON array of job titles in ranked order.
+    Output only a JSON array of the job "index" values in ranked order, e.g. [2, 0, 1].
     Jobs:
-    {job_text}
+    {json.dumps(candidates, indent=2)}
     """
 
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
+    text = await chat_completion(
+        [
             {"role": "system", "content": "You are an expert in resume-job relevance scoring."},
             {"role": "user", "content": prompt},
         ],
         temperature=0.3,
     )
 
+    match = re.search(r"\[.*?\]", text, re.DOTALL)
     try:
-        ranking = json.loads(response.choices[0].message.content)
-        ranked = [j for title in ranking for j in jobs if title.lower() in j["job_title"].lower()]
-        return ranked + [j for j in jobs if j not in ranked]
-    except:
-        return jobs
+        ranking = json.loads(match.group()) if match else []
+    except json.JSONDecodeError:
+        ranking = []
+
+    order = []
+    for index in ranking:
+        if isinstance(index, int) and not isinstance(index, bool) and 0 <= index < len(jobs) and index not in order:
+            order.append(index)
+    order += [i for i in range(len(jobs)) if i not in order]
+    return [jobs[i] for i in order]
 
 
 # =====================================================
@@ -98,7 +160,7 @@ async def rank_jobs_with_llm(skills: list, jobs: list):
 # =====================================================
 async def fetch_jsearch_jobs(session, skills, title, location, remote):
     headers = {"x-rapidapi-key": RAPIDAPI_KEY, "x-rapidapi-host": RAPIDAPI_HOST}
-    search_query = f"{title or 'developer'} {', '.join(skills[:3])}"
+    search_query = f"{title or 'developer'} {query_skills(skills)}"
     params = {
         "query": search_query,
         "page": "1",
@@ -114,7 +176,8 @@ async def fetch_jsearch_jobs(session, skills, title, location, remote):
     async with session.get(JSEARCH_URL, headers=headers, params=params) as resp:
         if resp.status != 200:
             print(f"⚠️ JSearch API failed: {resp.status}")
-            return []
+        # Raise so the cache can fall back to stale results
+        resp.raise_for_status()
         data = await resp.json()
         jobs = data.get("data", [])
         return [
@@ -125,6 +188,7 @@ async def fetch_jsearch_jobs(session, skills, title, location, remote):
                 "location": j.get("job_city") or j.get("job_country") or "Not specified",
                 "job_link": j.get("job_apply_link") or j.get("job_google_link") or "#",
                 "posted_date": j.get("job_posted_at_datetime_utc", "N/A"),
+                "description": (j.get("job_description") or "")[:1000],
             }
             for j in jobs[:10]
         ]
@@ -149,21 +213,22 @@ async def fetch_google_jobs(session, skills, title, location, remote):
         "site:amazon.jobs",
         "site:google.com/about/careers"
     ]
-    query = f"{title or 'developer'} {', '.join(skills[:3])} jobs " + " OR ".join(job_sites)
+    query = f"{title or 'developer'} {query_skills(skills)} jobs " + " OR ".join(job_sites)
     if location:
         query += f" in {location}"
     if remote:
         query += " remote"
 
     google_url = (
-        f"https://www.googleapis.com/customsearch/v1?q={query}"
+        f"{GOOGLE_SEARCH_URL}?q={query}"
         f"&key={GOOGLE_API_KEY}&cx={GOOGLE_CX_ID}&num=10"
     )
 
     async with session.get(google_url) as resp:
         if resp.status != 200:
             print(f"⚠️ Google API failed: {resp.status}")
-            return []
+        # Raise so the cache can fall back to stale results
+        resp.raise_for_status()
         data = await resp.json()
         items = data.get("items", [])
         return [
@@ -173,12 +238,60 @@ async def fetch_google_jobs(session, skills, title, location, remote):
                 "company_name": item.get("displayLink", "Unknown"),
                 "location": location or "India",
                 "job_link": item.get("link", "#"),
-                "posted_date": "N/A"
+                "posted_date": "N/A",
+                "description": item.get("snippet", ""),
             }
             for item in items[:10]
         ]
 
 
+# ✅ External sources with credentials configured (name, fetcher)
+JOB_SOURCES = [
+    (name, fetcher)
+    for name, fetcher, enabled in (
+        ("JSearch", fetch_jsearch_jobs, settings.jsearch_enabled),
+        ("Google", fetch_google_jobs, settings.google_search_enabled),
+    )
+    if enabled
+]
+
+
+def job_search_key(skills, title, location, remote):
+    """Normalized query tuple shared by every user searching the same thing."""
+    top_skills = tuple(sorted(s.lower() for s in canonicalize_skills(skills)[:3]))
+    return (
+        " ".join((title or "developer").lower().split()),
+        top_skills,
+        " ".join((location or "").lower().split()),
+        bool(remote),
+    )
+
+
+async def cached_job_search(source, fetcher, skills, title, location, remote):
+    """
+    Jobs from one external source. A failing or timed-out upstream never
+    fails the request: the cache serves stale results if it has any,
+    otherwise this source contributes no jobs.
+    """
+    async def upstream():
+        session = await http_clients.get_session()
+        jobs = await fetcher(session, skills, title, location, remote)
+        job_store.ingest_in_background(jobs)
+        return jobs
+
+    key = job_search_key(skills, title, location, remote)
+
+    async def fetch():
+        return await job_search_flights.do((source, key), upstream)
+
+    try:
+        with metrics.span("job_search", target=source, upstream=source):
+            return await job_search_caches[source].get_or_fetch(key, fetch)
+    except Exception as e:
+        print(f"⚠️ {source} job search failed: {e!r}")
+        return []
+
+
 # =====================================================
 # 🔹 Main Endpoint
 # =====================================================
@@ -187,32 +300,42 @@ async def upload_resume(
     file: UploadFile,
     title: str = Query(None, description="Optional job title to search for"),
     location: str = Query(None, description="Preferred job location"),
-    remote: bool = Query(False, description="Include remote jobs")
+    remote: bool = Query(False, description="Include remote jobs"),
+    llm_rerank: bool = Query(False, description="Re-rank the top matches with the LLM"),
+    local_first: bool = Query(False, description="Answer from the local job store when it has enough matches")
 ):
     try:
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-
-        # Extract resume text
-        resume_text = extract_resume_text(tmp_path)
+        # Stream the upload to a bounded temp file and extract text (cached by file hash)
+        async with ingest_pdf(file) as pdf:
+            resume_text = await pdf.text()
         if not resume_text.strip():
             raise HTTPException(status_code=400, detail="No readable text found in resume.")
 
-        # Extract skills using LLM
-        skills = await extract_skills_with_llm(resume_text)
+        # Extract skills using LLM (cached per resume)
+        with metrics.span("skill_extraction"):
+            skills = await get_resume_skills(resume_text)
         if not skills:
             raise HTTPException(status_code=500, detail="Skill extraction failed.")
 
-        async with aiohttp.ClientSession() as session:
-            # Run both job searches in parallel
-            jsearch_task = fetch_jsearch_jobs(session, skills, title, location, remote)
-            google_task = fetch_google_jobs(session, skills, title, location, remote)
-            jsearch_jobs, google_jobs = await asyncio.gather(jsearch_task, google_task)
+        # Local store first (if asked, or when no external source is configured),
+        # external APIs only when recall is low
+        local_jobs = []
+        if local_first or not JOB_SOURCES:
+            with metrics.span("local_job_search"):
+                local_jobs = await job_store.search_jobs(skills, title, location, remote)
 
-        # Combine and deduplicate
-        combined = jsearch_jobs + google_jobs
+        served_from = "local"
+        combined = local_jobs
+        if JOB_SOURCES and len(local_jobs) < LOCAL_MIN_RESULTS:
+            # Run the job searches in parallel (served from cache when possible)
+            results = await asyncio.gather(*(
+                cached_job_search(name, fetcher, skills, title, location, remote)
+                for name, fetcher in JOB_SOURCES
+            ))
+            served_from = "live"
+            combined = local_jobs + [job for jobs in results for job in jobs]
+
+        # Deduplicate by link
         unique = []
         seen = set()
         for job in combined:
@@ -220,13 +343,22 @@ async def upload_resume(
                 unique.append(job)
                 seen.add(job["job_link"])
 
-        # Rank jobs with LLM
-        ranked_jobs = await rank_jobs_with_llm(skills, unique)
+        # Rank every job locally, then optionally let the LLM reorder the top-k
+        with metrics.span("rank_jobs"):
+            ranked_jobs = rank_jobs(skills, unique)
+        if llm_rerank and settings.llm_enabled:
+            try:
+                with metrics.span("llm_rerank"):
+                    top = await rank_jobs_with_llm(skills, ranked_jobs[:RERANK_TOP_K])
+                ranked_jobs = top + ranked_jobs[RERANK_TOP_K:]
+            except Exception as e:
+                print(f"⚠️ LLM re-rank failed, keeping local order: {e}")
 
         return {
             "status": "success",
             "skills_extracted": skills,
             "filters": {"title": title, "location": location, "remote": remote},
+            "served_from": served_from,
             "total_jobs": len(ranked_jobs),
             "jobs": ranked_jobs
         }
@@ -236,3 +368,14 @@ async def upload_resume(
     except Exception as e:
         print(f"⚠️ Internal Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# =====================================================
+# 🔹 Job search cache stats
+# =====================================================
+@jobs_router.get("/job_cache/stats")
+async def job_cache_stats():
+    stats = {source: cache.stats() for source, cache in job_search_caches.items()}
+    stats["coalescing"] = job_search_flights.stats()
+    stats["skills"] = skill_cache.get_stats()
+    return stats
@@ -1,24 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request, UploadFile, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table, TableStyle
-)
-from groq import Groq
-import os, tempfile, traceback
+from urllib.parse import quote
+from config import settings
+from llm import chat_completion, stream_chat_completion, require_enabled, batch_priority
+from streaming import stream_tokens, ndjson_line
+import pdf_render
+from uploads import read_limited
+import io, re, csv, json, time, base64, asyncio, zipfile, traceback
 
 router = APIRouter(prefix="/api/resume", tags=["AI Resume Generator"])
 
-# ✅ Groq setup
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise ValueError("❌ Missing GROQ_API_KEY in .env")
-client = Groq(api_key=GROQ_API_KEY)
+# ✅ Every route here needs Groq; without GROQ_API_KEY they answer 503
+
+# ✅ Batch generation limits
+BATCH_CONCURRENCY = settings.resume_batch_concurrency
+BATCH_MAX_SIZE = settings.resume_batch_max_size
 
 
 class ResumeRequest(BaseModel):
@@ -34,9 +32,9 @@ class ResumeRequest(BaseModel):
     role_type: str
 
 
-# ✅ AI Resume Text Generation
-async def generate_resume_text(data: ResumeRequest) -> str:
-    prompt = f"""
+# ✅ AI Resume Prompt
+def build_resume_prompt(data: ResumeRequest) -> str:
+    return f"""
 You are a professional resume writer and designer.
 Create a clean, modern, one-page resume for a fresher applying as a {data.role_type}.
 Use a neutral tone, light color scheme (white background, soft pastel highlights), and keep it ATS-friendly (text-based).
@@ -64,13 +62,29 @@ Certifications: {data.certifications}
 Experience: {data.experience}
 """
 
+
+# ✅ PDF download response (same headers FileResponse would send)
+def pdf_response(pdf_bytes: bytes, filename: str) -> Response:
+    quoted = quote(filename)
+    if quoted != filename:
+        disposition = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        disposition = f'attachment; filename="{filename}"'
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": disposition},
+    )
+
+
+# ✅ AI Resume Text Generation
+async def generate_resume_text(data: ResumeRequest) -> str:
+    prompt = build_resume_prompt(data)
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        return await chat_completion(
+            [{"role": "user", "content": prompt}],
             temperature=0.6,
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Groq Error: {e}")
 
@@ -78,134 +92,205 @@ Experience: {data.experience}
 # ✅ Main Route
 @router.post("/generate-ai")
 async def generate_ai_resume(request: ResumeRequest):
+    require_enabled()
     try:
         resume_text = await generate_resume_text(request)
 
-        # ✅ Temp PDF path
-        temp_dir = tempfile.gettempdir()
-        pdf_name = f"{request.name.replace(' ', '_')}_Resume_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        pdf_path = os.path.join(temp_dir, pdf_name)
-
-        # ✅ PDF setup
-        doc = SimpleDocTemplate(
-            pdf_path,
-            pagesize=letter,
-            leftMargin=0.8 * inch,
-            rightMargin=0.8 * inch,
-            topMargin=0.8 * inch,
-            bottomMargin=0.8 * inch,
+        # ✅ Render in a worker process, straight into memory
+        pdf_bytes = await pdf_render.render_resume(
+            request.name, request.email, request.phone, resume_text
         )
+        pdf_name = f"{request.name.replace(' ', '_')}_Resume_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
+        print(f"✅ Light Canva + ATS Resume Created: {pdf_name} ({len(pdf_bytes)} bytes)")
 
-        styles = getSampleStyleSheet()
-        elements = []
-
-        # 🎨 Light Canva Theme Styles
-        header_bg = colors.HexColor("#E3F2FD")       # Light pastel blue
-        accent_color = colors.HexColor("#1976D2")    # Medium blue for text
-        soft_gray = colors.HexColor("#FAFAFA")
-
-        name_style = ParagraphStyle(
-            "NameStyle",
-            fontSize=20,
-            leading=24,
-            textColor=accent_color,
-            alignment=1,
-            spaceAfter=4,
-        )
-        contact_style = ParagraphStyle(
-            "ContactStyle",
-            fontSize=10.5,
-            textColor=colors.HexColor("#37474F"),
-            alignment=1,
-        )
-        section_title = ParagraphStyle(
-            "SectionTitle",
-            fontSize=13,
-            textColor=accent_color,
-            backColor=header_bg,
-            leftIndent=4,
-            spaceBefore=12,
-            spaceAfter=6,
-            leading=15,
-        )
-        text_style = ParagraphStyle(
-            "TextStyle",
-            fontSize=10.5,
-            leading=15,
-            textColor=colors.HexColor("#212121"),
-        )
-        bullet_style = ParagraphStyle(
-            "BulletStyle",
-            fontSize=10.5,
-            leading=15,
-            leftIndent=15,
-            bulletIndent=5,
-            textColor=colors.HexColor("#424242"),
-        )
+        return pdf_response(pdf_bytes, pdf_name)
 
-        # 🩵 Header (Name + Contact)
-        header_table = Table(
-            [
-                [Paragraph(f"<b>{request.name}</b>", name_style)],
-                [Paragraph(f"{request.email}   |   {request.phone}", contact_style)],
-            ],
-            colWidths=[6.2 * inch],
-        )
-        header_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, -1), header_bg),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ("TOPPADDING", (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 14))
-
-        # 🧩 Parse AI Resume Text (Prevent repetition)
-        current_section = None
-        seen_sections = set()
-
-        skip_keywords = ["name", "email", "phone", "contact", "resume", "applying as"]
-        section_keywords = {
-            "summary": "🧠 PROFESSIONAL SUMMARY",
-            "skill": "💻 TECHNICAL SKILLS",
-            "education": "🎓 EDUCATION",
-            "project": "🚀 PROJECTS",
-            "certification": "🏅 CERTIFICATIONS",
-            "experience": "💼 EXPERIENCE",
-            "highlight": "🌟 ADDITIONAL HIGHLIGHTS",
-        }
-
-        for line in resume_text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            lower = line.lower()
-            if any(key in lower for key in skip_keywords):
-                continue
-
-            matched_section = next((k for k in section_keywords if k in lower), None)
-            if matched_section and matched_section not in seen_sections:
-                seen_sections.add(matched_section)
-                elements.append(Paragraph(section_keywords[matched_section], section_title))
-                current_section = matched_section
-                continue
-
-            if line.startswith("-"):
-                elements.append(Paragraph(line[1:].strip(), bullet_style))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Server Error: {e}")
+
+
+# ✅ Streamed resume text (Server-Sent Events)
+@router.post("/generate-ai/stream")
+async def generate_ai_resume_stream(request: ResumeRequest, http_request: Request):
+    """
+    Stream the generated resume text token by token. The final `done`
+    event carries the full text.
+    """
+    require_enabled()
+    tokens = stream_chat_completion(
+        [{"role": "user", "content": build_resume_prompt(request)}],
+        temperature=0.6,
+    )
+    return stream_tokens(http_request, tokens)
+
+
+# =====================================================
+# 🔹 Bulk generation for placement-cell batches
+# =====================================================
+class ResumeBatchRequest(BaseModel):
+    resumes: list[ResumeRequest]
+
+
+class _ZipSink:
+    """Write-only file object; zipfile appends to it and we drain it."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def _batch_filename(index: int, name: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "candidate"
+    return f"{index + 1:03d}_{safe}_Resume.pdf"
+
+
+async def _generate_one(index: int, request: ResumeRequest, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        with batch_priority():
+            started = time.perf_counter()
+            try:
+                resume_text = await generate_resume_text(request)
+                pdf_bytes = await pdf_render.render_resume(
+                    request.name, request.email, request.phone, resume_text
+                )
+                return {
+                    "index": index,
+                    "name": request.name,
+                    "status": "ok",
+                    "filename": _batch_filename(index, request.name),
+                    "pdf": pdf_bytes,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                return {"index": index, "name": request.name, "status": "error", "error": detail}
+
+
+async def _run_batch(requests: list):
+    """Yield per-resume results as they finish, then a summary dict."""
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    tasks = [asyncio.create_task(_generate_one(i, r, semaphore)) for i, r in enumerate(requests)]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            failed += result["status"] != "ok"
+            yield result
+    finally:
+        # Client went away mid-batch: stop the remaining work.
+        for task in tasks:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "total": len(requests),
+        "succeeded": len(requests) - failed,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 2),
+        "resumes_per_sec": round(len(requests) / elapsed, 2) if elapsed else 0.0,
+    }
+    print(f"✅ Resume batch done: {summary}")
+    yield summary
+
+
+async def _zip_stream(requests: list):
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        failures = []
+        async for result in _run_batch(requests):
+            if "index" not in result:
+                report = {**result, "failures": failures}
+                archive.writestr("batch_report.json", json.dumps(report, indent=2))
+            elif result["status"] == "ok":
+                archive.writestr(result["filename"], result["pdf"])
             else:
-                elements.append(Paragraph(line, text_style))
+                failures.append({k: result[k] for k in ("index", "name", "error")})
+            yield sink.drain()
+    yield sink.drain()
 
-        # ✨ Soft divider at the end
-        elements.append(Spacer(1, 12))
-        elements.append(HRFlowable(width="100%", thickness=0.8, color=accent_color))
 
-        # Build PDF
-        doc.build(elements)
-        print(f"✅ Light Canva + ATS Resume Created: {pdf_path}")
+async def _ndjson_stream(requests: list):
+    async for result in _run_batch(requests):
+        if "index" not in result:
+            yield ndjson_line({"summary": result})
+            continue
+        pdf_bytes = result.pop("pdf", None)
+        if pdf_bytes is not None:
+            result["pdf_base64"] = base64.b64encode(pdf_bytes).decode("ascii")
+        yield ndjson_line(result)
 
-        return FileResponse(pdf_path, media_type="application/pdf", filename=pdf_name)
 
-    except Exception as e:
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Server Error: {e}")
+def _batch_response(requests: list, output: str) -> StreamingResponse:
+    require_enabled()
+    if not requests:
+        raise HTTPException(status_code=400, detail="No resumes in batch.")
+    if len(requests) > BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_SIZE} resumes).")
+
+    if output == "ndjson":
+        return StreamingResponse(_ndjson_stream(requests), media_type="application/x-ndjson")
+
+    archive_name = f"Resumes_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
+    return StreamingResponse(
+        _zip_stream(requests),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'},
+    )
+
+
+def _parse_batch_upload(raw: bytes, filename: str) -> list:
+    """Read ResumeRequest rows from a CSV (header row) or JSONL upload."""
+    text = raw.decode("utf-8-sig")
+    if filename.lower().endswith(".csv"):
+        rows = list(csv.DictReader(io.StringIO(text)))
+    else:
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    requests = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            requests.append(ResumeRequest(**row))
+        except (ValidationError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid row {number}: {e}")
+    return requests
+
+
+# ✅ Batch route (JSON body)
+@router.post("/generate-batch")
+async def generate_resume_batch(
+    batch: ResumeBatchRequest,
+    output: str = Query("zip", pattern="^(zip|ndjson)$", description="zip archive or NDJSON progress feed"),
+):
+    """
+    Generate many resumes at once. LLM calls and PDF renders run with
+    bounded concurrency and results stream back as each one completes.
+    """
+    return _batch_response(batch.resumes, output)
+
+
+# ✅ Batch route (CSV / JSONL upload)
+@router.post("/generate-batch/upload")
+async def generate_resume_batch_upload(
+    file: UploadFile,
+    output: str = Query("zip", pattern="^(zip|ndjson)$", description="zip archive or NDJSON progress feed"),
+):
+    try:
+        requests = _parse_batch_upload(await read_limited(file), file.filename or "")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse batch file: {e}")
+    return _batch_response(requests, output)
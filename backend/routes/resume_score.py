@@ -1,37 +1,34 @@
-from fastapi import APIRouter, UploadFile, Form
-from fastapi.responses import JSONResponse
-import fitz  # PyMuPDF for PDF text extraction
-from groq import Groq
-import os, re, json
-from dotenv import load_dotenv
+from fastapi import APIRouter, UploadFile, Form, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+import os, re, json, time, uuid, zlib, asyncio, zipfile
+from typing import Literal
+from config import settings
+from llm import chat_completion, require_enabled, batch_priority
+import pdf_text
+from pdf_text import extract_pdf_text
+from uploads import ingest_pdf, read_limited, CHUNK_SIZE, MAX_UPLOAD_BYTES, MAX_PDF_PAGES
+from streaming import ndjson_line
+from cache import TTLCache
+import ats_scorer
 
 resume_router = APIRouter()
-load_dotenv()
 
-# ✅ Configure Groq client
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# ✅ Batch scoring limits
+SCORE_BATCH_CONCURRENCY = settings.score_batch_concurrency
+SCORE_BATCH_MAX_SIZE = settings.score_batch_max_size
+SCORE_BATCH_MAX_ZIP_BYTES = settings.score_batch_max_zip_bytes
+# Budget for all PDFs in one batch after unpacking ZIPs
+SCORE_BATCH_MAX_TOTAL_BYTES = settings.score_batch_max_total_bytes
+# Job descriptions longer than this are condensed once per batch
+JD_DIGEST_MIN_CHARS = settings.jd_digest_min_chars
 
+# Background LLM analyses requested alongside a fast score
+analysis_results = TTLCache(maxsize=1024, ttl=3600)
+_analysis_tasks = set()
 
-def extract_text_from_pdf(file):
-    """Extract plain text from uploaded PDF file"""
-    pdf = fitz.open(stream=file, filetype="pdf")
-    text = ""
-    for page in pdf:
-        text += page.get_text("text")
-    return text
 
-
-@resume_router.post("/resume_score")
-async def resume_score(resume: UploadFile, job_description: str = Form("")):
-    if not resume:
-        return JSONResponse({"error": "No resume uploaded"}, status_code=400)
-
-    # ✅ Read the resume bytes and extract text
-    resume_bytes = await resume.read()
-    resume_text = extract_text_from_pdf(resume_bytes)
-
-    # ✅ LLM prompt for Groq
-    prompt = f"""
+def build_score_prompt(resume_text: str, job_description: str) -> str:
+    return f"""
     You are an expert resume evaluator. Analyze the following resume for job readiness.
     Compare it with the provided job description (if available).
 
@@ -50,26 +47,278 @@ async def resume_score(resume: UploadFile, job_description: str = Form("")):
     }}
     """
 
+
+async def score_resume_text(resume_text: str, job_description: str):
+    """
+    Ask the LLM to score a resume. Returns (data, raw_output); data is
+    None when the model did not answer with a JSON object.
+    """
+    # ✅ Use Groq’s LLM (LLaMA 3)
+    response_text = await chat_completion(
+        [{"role": "user", "content": build_score_prompt(resume_text, job_description)}],
+        temperature=0.2,
+    )
+
+    # ✅ Extract valid JSON response
+    match = re.search(r"\{.*\}", response_text, re.DOTALL)
+    if not match:
+        return None, response_text
+    return json.loads(match.group(0)), response_text
+
+
+async def _run_analysis(analysis_id: str, resume_text: str, job_description: str):
+    try:
+        data, response_text = await score_resume_text(resume_text, job_description)
+        if data is None:
+            analysis_results.set(analysis_id, {
+                "status": "error",
+                "error": "Invalid response format from LLM.",
+                "raw_output": response_text,
+            })
+        else:
+            analysis_results.set(analysis_id, {"status": "done", "result": data})
+    except Exception as e:
+        analysis_results.set(analysis_id, {"status": "error", "error": str(e)})
+
+
+def start_llm_analysis(resume_text: str, job_description: str) -> str:
+    analysis_id = uuid.uuid4().hex
+    analysis_results.set(analysis_id, {"status": "pending"})
+    task = asyncio.create_task(_run_analysis(analysis_id, resume_text, job_description))
+    _analysis_tasks.add(task)
+    task.add_done_callback(_analysis_tasks.discard)
+    return analysis_id
+
+
+@resume_router.post("/resume_score")
+async def resume_score(
+    resume: UploadFile,
+    job_description: str = Form(""),
+    mode: Literal["fast", "llm"] = Form("llm"),
+    llm_analysis: bool = Form(False),
+):
+    """
+    mode="llm" (default) returns the full LLM evaluation. mode="fast"
+    returns the local ATS score in milliseconds; with llm_analysis=true
+    the LLM evaluation also starts in the background and can be fetched
+    from /resume_score/analysis/{analysis_id}. Without GROQ_API_KEY only
+    mode="fast" is available.
+    """
+    if not resume:
+        return JSONResponse({"error": "No resume uploaded"}, status_code=400)
+    if mode != "fast":
+        require_enabled()
+
+    # ✅ Stream the upload to a bounded temp file and extract text
+    async with ingest_pdf(resume) as pdf:
+        resume_text = await pdf.text()
+
+    if mode == "fast":
+        result = ats_scorer.score_resume(resume_text, job_description)
+        if llm_analysis and settings.llm_enabled:
+            result["analysis_id"] = start_llm_analysis(resume_text, job_description)
+        return JSONResponse(result)
+
     try:
-        # ✅ Use Groq’s LLM (LLaMA 3)
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-        )
-
-        response_text = completion.choices[0].message.content.strip()
-
-        # ✅ Extract valid JSON response
-        match = re.search(r"\{.*\}", response_text, re.DOTALL)
-        if not match:
+        data, response_text = await score_resume_text(resume_text, job_description)
+        if data is None:
             return JSONResponse({
                 "error": "Invalid response format from LLM.",
                 "raw_output": response_text
             }, status_code=500)
 
-        data = json.loads(match.group(0))
         return JSONResponse(data)
 
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
+
+
+@resume_router.get("/resume_score/analysis/{analysis_id}")
+async def resume_score_analysis(analysis_id: str):
+    result = analysis_results.get(analysis_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired.")
+    return JSONResponse(result)
+
+
+@resume_router.get("/pdf_cache/stats")
+async def pdf_cache_stats():
+    """Extracted-text cache shared by every PDF upload endpoint."""
+    return pdf_text.get_stats()
+
+
+# =====================================================
+# 🔹 Batch scoring: many resumes against one JD
+# =====================================================
+async def digest_job_description(job_description: str) -> str:
+    """
+    Condense a long JD once per batch so each resume prompt carries a
+    short requirements list instead of the full posting.
+    """
+    if len(job_description) < JD_DIGEST_MIN_CHARS:
+        return job_description
+
+    prompt = f"""
+    Summarize this job description for resume screening. List the role,
+    required skills, preferred skills, minimum experience and education
+    as short bullet points. Keep every hard requirement; drop company
+    boilerplate.
+
+    Job Description:
+    {job_description}
+    """
+    try:
+        return await chat_completion([{"role": "user", "content": prompt}], temperature=0.0)
+    except Exception as e:
+        print(f"⚠️ JD digest failed, using full description: {e}")
+        return job_description
+
+
+def _batch_too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+
+class _BatchReader:
+    """
+    Collects (filename, bytes) for a batch while enforcing the entry count,
+    the per-file size and the total decompressed size. Entries are checked
+    against their declared file_size before reading and inflated in
+    CHUNK_SIZE pieces against both limits. A forged, too-small file_size
+    is handled by zipfile itself: it stops inflating at the declared size
+    and the CRC check fails (BadZipFile -> 400).
+    """
+
+    def __init__(self):
+        self.files = []
+        self.total_bytes = 0
+
+    def _check_count(self):
+        if len(self.files) >= SCORE_BATCH_MAX_SIZE:
+            raise _batch_too_large(f"Batch too large (max {SCORE_BATCH_MAX_SIZE} resumes).")
+
+    def _count(self, size: int):
+        self.total_bytes += size
+        if self.total_bytes > SCORE_BATCH_MAX_TOTAL_BYTES:
+            raise _batch_too_large(f"Batch too large (max {SCORE_BATCH_MAX_TOTAL_BYTES / (1024 * 1024):.0f} MB of PDFs).")
+
+    async def add_upload(self, name: str, upload: UploadFile):
+        self._check_count()
+        data = await read_limited(upload)
+        self._count(len(data))
+        self.files.append((name, data))
+
+    def add_zip(self, fileobj):
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                base = os.path.basename(info.filename)
+                if info.is_dir() or info.filename.startswith("__MACOSX") or not base.lower().endswith(".pdf"):
+                    continue
+                self._check_count()
+                if info.file_size > MAX_UPLOAD_BYTES:
+                    raise _batch_too_large(f"{base} is too large.")
+                self.files.append((base, self._read_entry(archive, info, base)))
+
+    def _read_entry(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo, base: str) -> bytes:
+        chunks, size = [], 0
+        with archive.open(info) as entry:
+            while chunk := entry.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _batch_too_large(f"{base} is too large.")
+                self._count(len(chunk))
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+
+async def _read_batch_files(resumes: list) -> list:
+    """(filename, bytes) for every PDF in the uploads, unpacking ZIPs."""
+    reader = _BatchReader()
+    for upload in resumes:
+        name = upload.filename or "resume.pdf"
+        if name.lower().endswith(".zip"):
+            # ✅ Open the spooled upload in place instead of copying it into memory
+            zip_size = upload.size if upload.size is not None else upload.file.seek(0, os.SEEK_END)
+            if zip_size > SCORE_BATCH_MAX_ZIP_BYTES:
+                raise _batch_too_large(f"ZIP too large (max {SCORE_BATCH_MAX_ZIP_BYTES / (1024 * 1024):.0f} MB).")
+            upload.file.seek(0)
+            await asyncio.to_thread(reader.add_zip, upload.file)
+        else:
+            await reader.add_upload(name, upload)
+    return reader.files
+
+
+async def _score_one(index: int, filename: str, data: bytes, job_context: str, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        with batch_priority():
+            try:
+                resume_text = await extract_pdf_text(data, max_pages=MAX_PDF_PAGES)
+                if not resume_text.strip():
+                    raise ValueError("No readable text found in resume.")
+                result, raw = await score_resume_text(resume_text, job_context)
+                if result is None:
+                    raise ValueError("Invalid response format from LLM.")
+                # Bookkeeping keys last so the model output cannot overwrite them
+                return {**result, "index": index, "filename": filename, "status": "ok"}
+            except Exception as e:
+                return {"index": index, "filename": filename, "status": "error", "error": str(e)}
+
+
+async def _score_batch(files: list, job_description: str):
+    started = time.perf_counter()
+    job_context = await digest_job_description(job_description)
+
+    semaphore = asyncio.Semaphore(SCORE_BATCH_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_score_one(i, name, data, job_context, semaphore))
+        for i, (name, data) in enumerate(files)
+    ]
+    scored = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result["status"] == "ok":
+                scored.append(result)
+            yield ndjson_line(result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    def score_of(result):
+        try:
+            return float(result.get("score", 0))
+        except (TypeError, ValueError):
+            return 0.0
+
+    ranking = sorted(scored, key=score_of, reverse=True)
+    yield ndjson_line({
+        "ranking": [
+            {"rank": rank, "filename": r["filename"], "score": r.get("score")}
+            for rank, r in enumerate(ranking, start=1)
+        ],
+        "summary": {
+            "total": len(files),
+            "scored": len(scored),
+            "failed": len(files) - len(scored),
+            "elapsed_s": round(time.perf_counter() - started, 2),
+        },
+    })
+
+
+@resume_router.post("/resume_score/batch")
+async def resume_score_batch(resumes: list[UploadFile], job_description: str = Form(...)):
+    """
+    Score many resumes (PDFs and/or ZIPs of PDFs) against one job
+    description. Streams one NDJSON line per resume as it finishes and
+    a final line with the resumes ranked by score.
+    """
+    require_enabled()
+    try:
+        files = await _read_batch_files(resumes)
+    except (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError) as e:
+        # Corrupt, truncated, encrypted or unsupported-compression archives
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP upload: {e}")
+
+    if not files:
+        raise HTTPException(status_code=400, detail="No PDF resumes found in upload.")
+
+    return StreamingResponse(_score_batch(files, job_description), media_type="application/x-ndjson")
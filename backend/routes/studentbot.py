@@ -1,21 +1,17 @@
-import os
-import requests
-from dotenv import load_dotenv
-from groq import Groq
+from config import settings
+from llm import chat_completion, stream_chat_completion
+import answer_cache
 
-# ✅ Load environment variables
-load_dotenv()
-
-# ✅ Initialize Groq client
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 def test_connection():
     """
     Optional: Test Groq API connection & available models.
     """
+    import requests
+
     try:
         url = "https://api.groq.com/openai/v1/models"
-        headers = {"Authorization": f"Bearer {os.getenv('GROQ_API_KEY')}"}
+        headers = {"Authorization": f"Bearer {settings.groq_api_key}"}
         resp = requests.get(url, headers=headers)
         if resp.status_code == 200:
             print("✅ Groq API Connected Successfully!")
@@ -26,34 +22,49 @@ def test_connection():
         print("⚠️ Error connecting to Groq API:", e)
 
 
-def get_ai_response(user_query: str) -> str:
+def build_tutor_messages(user_query: str) -> list:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an intelligent and friendly AI tutor. "
+                "You explain concepts clearly, provide real-world examples, "
+                "and help students understand complex topics in simple terms."
+            ),
+        },
+        {"role": "user", "content": user_query},
+    ]
+
+
+async def get_ai_response(user_query: str) -> str:
     """
     Get an AI-generated response from the Groq Llama3 model.
     """
+    cached = answer_cache.get_answer("ask", user_query)
+    if cached is not None:
+        return cached
+
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an intelligent and friendly AI tutor. "
-                        "You explain concepts clearly, provide real-world examples, "
-                        "and help students understand complex topics in simple terms."
-                    ),
-                },
-                {"role": "user", "content": user_query},
-            ],
-        )
-
-        return response.choices[0].message.content.strip()
+        answer = await chat_completion(build_tutor_messages(user_query))
+        answer_cache.store_answer("ask", user_query, answer)
+        return answer
 
     except Exception as e:
         return f"⚠️ Sorry, I ran into an error while processing your question: {str(e)}"
 
 
+def stream_ai_response(user_query: str):
+    """
+    Stream the tutor's answer token by token (async generator).
+    """
+    return answer_cache.cached_stream(
+        "ask", user_query, stream_chat_completion(build_tutor_messages(user_query))
+    )
+
+
 # ✅ Optional: Uncomment to test locally
 # if __name__ == "__main__":
+#     import asyncio
 #     test_connection()
 #     query = input("Ask something: ")
-#     print(get_ai_response(query))
+#     print(asyncio.run(get_ai_response(query)))
@@ -1,55 +1,88 @@
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-import requests
-import os
-from dotenv import load_dotenv
-
-# ✅ Load environment variables
-load_dotenv()
+import asyncio
+import aiohttp
+from config import settings
+import http_clients
+import youtube_cache
 
 tutor_router = APIRouter()
 
-# ✅ YouTube API Config
-YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
-YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+# ✅ YouTube API Config (live search is disabled when no key is configured)
+YOUTUBE_API_KEY = settings.youtube_api_key
+YOUTUBE_SEARCH_URL = settings.youtube_search_url
+
+# ✅ Shown when neither the cache nor the API can answer
+RECOMMENDED_VIDEOS = [
+    {"id": "rfscVS0vtbw", "title": "Python Full Course for Beginners"},
+    {"id": "GwIo3gDZCVQ", "title": "Machine Learning Tutorial for Beginners"},
+    {"id": "RBSGKlAvoiM", "title": "React JS Crash Course"},
+    {"id": "aircAruvnKk", "title": "Deep Learning with Python - Full Course"},
+    {"id": "XKHEtdqhLK8", "title": "Data Science Roadmap 2025"},
+    {"id": "f02mOEt11OQ", "title": "AI Explained in Simple Terms"},
+]
+
+
+async def fetch_youtube_videos(q: str) -> list:
+    params = {
+        "part": "snippet",
+        "q": q,
+        "type": "video",
+        "maxResults": 6,
+        "key": YOUTUBE_API_KEY,
+    }
+    session = await http_clients.get_session()
+    async with session.get(YOUTUBE_SEARCH_URL, params=params) as response:
+        if response.status == 403 and "quotaExceeded" in await response.text():
+            raise youtube_cache.QuotaExceeded()
+        response.raise_for_status()
+        data = await response.json()
+
+    return [
+        {
+            "id": item["id"]["videoId"],
+            "title": item["snippet"]["title"],
+            "thumbnail": item["snippet"]["thumbnails"]["high"]["url"],
+            "channel": item["snippet"]["channelTitle"],
+        }
+        for item in data.get("items", [])
+    ]
 
 
 # 🎯 1. Dynamic YouTube Video Search
 @tutor_router.get("/youtube_videos")
-def get_youtube_videos(q: str = Query(..., description="Search term for YouTube videos")):
+async def get_youtube_videos(q: str = Query(..., description="Search term for YouTube videos")):
     """
     Fetch YouTube videos dynamically from YouTube Data API v3.
+    Searches are cached and budgeted against the daily API quota; when
+    the budget runs low, cached results for a related query are returned
+    instead (`source` says which).
     """
+    fetch = fetch_youtube_videos if settings.youtube_enabled else None
     try:
-        params = {
-            "part": "snippet",
-            "q": q,
-            "type": "video",
-            "maxResults": 6,
-            "key": YOUTUBE_API_KEY,
-        }
-        response = requests.get(YOUTUBE_SEARCH_URL, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-        videos = [
-            {
-                "id": item["id"]["videoId"],
-                "title": item["snippet"]["title"],
-                "thumbnail": item["snippet"]["thumbnails"]["high"]["url"],
-                "channel": item["snippet"]["channelTitle"],
-            }
-            for item in data.get("items", [])
-        ]
-
-        return JSONResponse(content={"videos": videos or []})
-
-    except requests.exceptions.RequestException as e:
+        result = await youtube_cache.search(q, fetch)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         return JSONResponse(
             content={"error": "Failed to fetch videos", "details": str(e)},
             status_code=500,
         )
 
+    if result["source"] != "unavailable":
+        return JSONResponse(content=result)
+    if not settings.youtube_enabled:
+        return JSONResponse(
+            content={"error": "YouTube search is disabled: YOUTUBE_API_KEY is not set.", "videos": []},
+            status_code=503,
+        )
+    # Daily quota spent and nothing cached: fall back to the curated list
+    return JSONResponse(content={"videos": RECOMMENDED_VIDEOS, "source": "recommended"})
+
+
+# ✅ YouTube cache hit rates and today's quota budget
+@tutor_router.get("/youtube_cache/stats")
+async def youtube_cache_stats():
+    return youtube_cache.get_stats()
+
 
 # 🌟 2. Static Recommended Videos
 @tutor_router.get("/recommended_videos")
@@ -57,15 +90,7 @@ def get_recommended_videos():
     """
     Return a list of static recommended YouTube videos.
     """
-    videos = [
-        {"id": "rfscVS0vtbw", "title": "Python Full Course for Beginners"},
-        {"id": "GwIo3gDZCVQ", "title": "Machine Learning Tutorial for Beginners"},
-        {"id": "RBSGKlAvoiM", "title": "React JS Crash Course"},
-        {"id": "aircAruvnKk", "title": "Deep Learning with Python - Full Course"},
-        {"id": "XKHEtdqhLK8", "title": "Data Science Roadmap 2025"},
-        {"id": "f02mOEt11OQ", "title": "AI Explained in Simple Terms"},
-    ]
-    return JSONResponse(content={"videos": videos})
+    return JSONResponse(content={"videos": RECOMMENDED_VIDEOS})
 
 
 # 📚 3. Dynamic + Static Recommended Courses
@@ -0,0 +1,35 @@
+import asyncio
+
+# =====================================================
+# 🔹 Single-flight request coalescing
+# =====================================================
+# Concurrent callers asking for the same key share one upstream call:
+# the first caller starts it, everyone else awaits the same task. The
+# task is shielded so one caller disconnecting does not cancel the
+# call for the others.
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """Return `await fn()`, sharing the call with concurrent callers of `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+        }
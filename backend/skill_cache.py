@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime, timezone
+from config import settings
+from cache import TTLCache
+import metrics
+
+# =====================================================
+# 🔹 Extracted-skill cache keyed by resume fingerprint
+# =====================================================
+# Changing title/location/remote filters on the same resume reuses the
+# skills extracted the first time instead of paying for another LLM call.
+# Set SKILL_CACHE_PERSIST=true to also keep entries in MongoDB
+# (collection `skill_cache`, expired by a TTL index).
+
+SKILL_CACHE_TTL = settings.skill_cache_ttl
+SKILL_CACHE_SIZE = settings.skill_cache_size
+SKILL_CACHE_PERSIST = settings.skill_cache_persist
+
+_memory = TTLCache(maxsize=SKILL_CACHE_SIZE, ttl=SKILL_CACHE_TTL)
+metrics.register_cache("skills", _memory)
+_collection = None
+_index_ready = False
+
+
+def resume_key(resume_text: str) -> str:
+    """Hash of the whitespace-normalized resume text."""
+    normalized = " ".join(resume_text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+async def _get_collection():
+    global _collection, _index_ready
+    if _collection is None:
+        from database import db
+        _collection = db["skill_cache"]
+    if not _index_ready:
+        await _collection.create_index("created_at", expireAfterSeconds=SKILL_CACHE_TTL)
+        _index_ready = True
+    return _collection
+
+
+async def _load(key: str):
+    doc = await (await _get_collection()).find_one({"_id": key}, {"skills": 1})
+    return doc["skills"] if doc else None
+
+
+async def _store(key: str, skills: list):
+    await (await _get_collection()).replace_one(
+        {"_id": key},
+        {"skills": skills, "created_at": datetime.now(timezone.utc)},
+        upsert=True,
+    )
+
+
+async def get_cached_skills(key: str):
+    skills = _memory.get(key)
+    if skills is not None or not SKILL_CACHE_PERSIST:
+        return skills
+    try:
+        skills = await _load(key)
+    except Exception as e:
+        print(f"⚠️ Skill cache read failed: {e}")
+        return None
+    if skills is not None:
+        _memory.set(key, skills)
+    return skills
+
+
+async def cache_skills(key: str, skills: list):
+    _memory.set(key, skills)
+    if SKILL_CACHE_PERSIST:
+        try:
+            await _store(key, skills)
+        except Exception as e:
+            print(f"⚠️ Skill cache write failed: {e}")
+
+
+def get_stats() -> dict:
+    return {**_memory.stats(), "persistent": SKILL_CACHE_PERSIST}
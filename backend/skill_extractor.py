@@ -0,0 +1,131 @@
+import re
+from collections import deque
+from config import settings
+from skill_taxonomy import SKILL_TAXONOMY, AMBIGUOUS_NAMES
+
+# =====================================================
+# 🔹 Local skill extractor (Aho-Corasick over the taxonomy)
+# =====================================================
+# All taxonomy aliases are compiled once into a single automaton, so a
+# resume is scanned in one pass regardless of how many skills we know.
+# Results are canonical names ordered by how often they are mentioned.
+
+# Fewer local matches than this means the resume likely uses vocabulary
+# outside the taxonomy, so the caller should fall back to the LLM.
+LOCAL_MIN_SKILLS = settings.local_min_skills
+
+_SEPARATORS = re.compile(r"[-_\s]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, map '-'/'_' to spaces and collapse whitespace."""
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton mapping normalized aliases to canonical skills."""
+
+    def __init__(self, taxonomy: dict, ambiguous: set = frozenset()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self.aliases = {}
+
+        for canonical, aliases in taxonomy.items():
+            names = list(aliases)
+            if canonical not in ambiguous:
+                names.append(canonical)
+            for alias in names:
+                key = normalize(alias)
+                if key:
+                    self.aliases[key] = canonical
+        # Canonical names resolve to themselves even when ambiguous, so
+        # LLM output like "Go" still canonicalizes.
+        self._lookup = {**self.aliases, **{normalize(c): c for c in taxonomy}}
+
+        for alias, canonical in self.aliases.items():
+            self._add(alias, canonical)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, canonical: str):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str):
+        """Yield (start, end, canonical) for whole-word matches in normalized text."""
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, canonical in self._out[state]:
+                start, end = i - length + 1, i + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                yield start, end, canonical
+
+    def canonical(self, name: str):
+        """Canonical taxonomy name for a skill string, or None if unknown."""
+        return self._lookup.get(normalize(name))
+
+
+_matcher = SkillMatcher(SKILL_TAXONOMY, AMBIGUOUS_NAMES)
+
+
+def extract_skills_locally(text: str):
+    """
+    Return (skills, confident): canonical skills found in the text, most
+    mentioned first, and whether coverage is good enough to skip the LLM.
+    """
+    normalized = normalize(text)
+    matches = sorted(_matcher.find(normalized), key=lambda m: (m[0], m[0] - m[1]))
+
+    # Leftmost-longest: "react native" wins over the "react" inside it.
+    counts, first_seen = {}, {}
+    last_end = -1
+    for start, end, canonical in matches:
+        if start < last_end:
+            continue
+        last_end = end
+        counts[canonical] = counts.get(canonical, 0) + 1
+        first_seen.setdefault(canonical, start)
+
+    skills = sorted(counts, key=lambda s: (-counts[s], first_seen[s]))
+    return skills, len(skills) >= LOCAL_MIN_SKILLS
+
+
+def canonicalize_skills(skills: list) -> list:
+    """Map free-form skill names onto the taxonomy and drop duplicates."""
+    result, seen = [], set()
+    for skill in skills:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        name = _matcher.canonical(skill) or skill.strip()
+        key = name.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(name)
+    return result
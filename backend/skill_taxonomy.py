@@ -0,0 +1,130 @@
+# =====================================================
+# 🔹 Canonical skill taxonomy
+# =====================================================
+# Canonical skill name -> aliases seen in resumes. Matching is
+# case-insensitive and treats "-"/"_" as spaces, so "machine-learning"
+# only needs the "machine learning" spelling. The canonical name itself
+# is matched too, except for names in AMBIGUOUS_NAMES that are ordinary
+# English words; very short tokens ("r", "c") are left out on purpose
+# and are picked up by the LLM fallback instead.
+SKILL_TAXONOMY = {
+    # Languages
+    "Python": ["python3", "python 3"],
+    "Java": ["core java", "java se", "java ee", "j2ee"],
+    "JavaScript": ["js", "es6", "ecmascript", "vanilla js"],
+    "TypeScript": [],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["c sharp", "csharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Kotlin": [],
+    "Swift": [],
+    "PHP": [],
+    "Ruby": [],
+    "Scala": [],
+    "MATLAB": [],
+    "Dart": [],
+    "Bash": ["shell scripting", "shell script", "bash scripting"],
+    "SQL": ["structured query language", "t sql", "pl sql", "plsql"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+
+    # Frontend
+    "React": ["react.js", "reactjs", "react js"],
+    "React Native": ["react native"],
+    "Angular": ["angular.js", "angularjs"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Next.js": ["nextjs", "next js"],
+    "Redux": [],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Bootstrap": [],
+    "jQuery": [],
+    "Flutter": [],
+
+    # Backend
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["expressjs", "express js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot", "spring framework"],
+    "ASP.NET": ["asp.net core", "asp net"],
+    ".NET": ["dotnet", "dot net", ".net core"],
+    "REST APIs": ["rest api", "restful", "restful apis", "restful api", "rest apis"],
+    "GraphQL": [],
+    "Microservices": ["microservice", "micro services"],
+
+    # Data & AI
+    "Machine Learning": ["ml", "machine learning"],
+    "Deep Learning": ["dl"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": ["opencv", "open cv"],
+    "Generative AI": ["genai", "gen ai", "llm", "llms", "large language models"],
+    "Data Science": [],
+    "Data Analysis": ["data analytics", "data analyst"],
+    "Data Visualization": ["data visualisation"],
+    "Statistics": ["statistical analysis"],
+    "TensorFlow": ["tensor flow"],
+    "PyTorch": ["torch"],
+    "Keras": [],
+    "scikit-learn": ["sklearn", "scikit learn", "scikit"],
+    "Pandas": [],
+    "NumPy": [],
+    "Matplotlib": [],
+    "Power BI": ["powerbi"],
+    "Tableau": [],
+    "Excel": ["ms excel", "microsoft excel", "advanced excel"],
+    "Apache Spark": ["spark", "pyspark"],
+    "Hadoop": [],
+    "ETL": [],
+
+    # Databases
+    "MongoDB": ["mongo", "mongo db"],
+    "MySQL": ["my sql"],
+    "PostgreSQL": ["postgres", "postgre sql"],
+    "Oracle Database": ["oracle", "oracle db"],
+    "Redis": [],
+    "Firebase": [],
+    "SQLite": [],
+
+    # Cloud & DevOps
+    "AWS": ["amazon web services"],
+    "Microsoft Azure": ["azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Jenkins": [],
+    "CI/CD": ["ci cd", "continuous integration", "continuous deployment"],
+    "Terraform": [],
+    "Linux": ["unix", "ubuntu"],
+    "Git": ["github", "gitlab", "version control"],
+    "DevOps": [],
+
+    # Practices & tools
+    "Data Structures and Algorithms": ["dsa", "data structures", "algorithms"],
+    "Object-Oriented Programming": ["oop", "oops", "object oriented programming"],
+    "Agile": ["scrum", "agile methodology"],
+    "Unit Testing": ["software testing", "pytest", "junit", "jest"],
+    "Selenium": [],
+    "Postman": [],
+    "Figma": [],
+    "UI/UX Design": ["ui ux", "ui design", "ux design", "user experience"],
+    "Cybersecurity": ["cyber security", "information security", "network security"],
+    "Networking": ["computer networks", "tcp/ip"],
+    "Blockchain": [],
+    "Android Development": ["android"],
+    "iOS Development": ["ios"],
+
+    # Soft skills
+    "Communication": ["communication skills", "verbal communication", "written communication"],
+    "Leadership": ["team leadership", "leading teams"],
+    "Teamwork": ["team player", "collaboration", "team work"],
+    "Problem Solving": ["problem solving skills", "analytical skills", "critical thinking"],
+    "Time Management": [],
+    "Adaptability": [],
+}
+
+# Canonical names that are also common English words ("go to market",
+# "excel at"); these are only matched through their aliases.
+AMBIGUOUS_NAMES = {"Go", "Excel"}
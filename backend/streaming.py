@@ -0,0 +1,43 @@
+import json
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+# =====================================================
+# 🔹 Server-Sent Events helpers for LLM token streams
+# =====================================================
+# Each token is sent as `data: {"token": "..."}`; the stream ends with
+# an `event: done` carrying the full text, or `event: error`.
+
+
+def ndjson_line(data: dict) -> bytes:
+    return (json.dumps(data) + "\n").encode("utf-8")
+
+
+def sse_event(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def stream_tokens(request: Request, tokens) -> StreamingResponse:
+    """Forward an async token generator to the client as SSE."""
+    async def events():
+        parts = []
+        try:
+            async for token in tokens:
+                if await request.is_disconnected():
+                    break
+                parts.append(token)
+                yield sse_event({"token": token})
+            else:
+                yield sse_event({"text": "".join(parts).strip()}, event="done")
+        except Exception as e:
+            yield sse_event({"detail": str(e)}, event="error")
+        finally:
+            # Stops the upstream generation if we exited early.
+            await tokens.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
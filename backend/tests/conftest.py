@@ -0,0 +1,50 @@
+import os
+import sys
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+# Dummy credentials so every optional feature is enabled; nothing here
+# talks to the real services.
+for name in ("GROQ_API_KEY", "RAPIDAPI_KEY", "GOOGLE_API_KEY", "GOOGLE_CX_ID", "YOUTUBE_API_KEY"):
+    os.environ.setdefault(name, "test-key")
+os.environ.setdefault("YOUTUBE_CACHE_PERSIST", "false")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+@pytest.fixture(scope="session")
+def resume_pdf() -> bytes:
+    from pdf_render import render_resume_pdf
+    from fake_upstreams import RESUME_TEXT
+    return render_resume_pdf("Test User", "test@example.com", "+91 90000 00000", RESUME_TEXT)
+
+
+@pytest.fixture
+def mongo():
+    """In-memory Mongo (benchmarks/fake_mongo.py) for the duration of one test."""
+    pytest.importorskip("mongomock")
+    import fake_mongo
+    import database
+    import job_store
+    import reset_tokens
+
+    patched = [
+        (database, "db"), (database, "users_collection"), (database, "jobs_collection"),
+        (database, "reset_tokens_collection"), (job_store, "jobs_collection"),
+        (reset_tokens, "reset_tokens_collection"),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name in patched]
+    yield fake_mongo.install()
+    for module, name, value in saved:
+        setattr(module, name, value)
+    reset_tokens._memory.clear()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    with TestClient(main.app) as c:
+        yield c
@@ -0,0 +1,37 @@
+import ats_scorer
+
+JOB_DESCRIPTION = """
+We are hiring! Join our team in this exciting role. The ideal candidate
+has strong Python and SQL skills, builds REST APIs with FastAPI and
+deploys them with Docker. Great opportunity to grow.
+"""
+
+
+def test_keywords_are_taxonomy_skills_only():
+    keywords = ats_scorer.job_keywords(JOB_DESCRIPTION)
+    assert {"Python", "SQL", "FastAPI", "Docker"} <= set(keywords)
+    for filler in ("hiring", "join", "team", "role", "ideal", "opportunity", "exciting"):
+        assert filler not in {k.lower() for k in keywords}
+
+
+def test_missing_keywords_are_real_skills():
+    resume = "Skills: Python, SQL, FastAPI\nExperience\n- Built REST APIs"
+    result = ats_scorer.score_resume(resume, JOB_DESCRIPTION)
+    assert result["missing_keywords"] == ["Docker"]
+    assert result["keyword_coverage"] == 80.0
+
+
+def test_jd_without_known_skills_scores_like_no_jd():
+    resume = "Summary\nSkills: Python\nExperience\nEducation"
+    with_jd = ats_scorer.score_resume(resume, "We are hiring! Join us in an exciting role.")
+    assert with_jd["keyword_coverage"] is None
+    assert with_jd["score"] == ats_scorer.score_resume(resume)["score"]
+
+
+def test_resume_score_rejects_unknown_mode(client, resume_pdf):
+    r = client.post(
+        "/api/resume_score",
+        files={"resume": ("resume.pdf", resume_pdf, "application/pdf")},
+        data={"mode": "fsat"},
+    )
+    assert r.status_code == 422
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from cache import StaleWhileRevalidateCache
+from routes import jobs
+
+
+def _job(source, i):
+    return {
+        "source": source, "job_title": f"Python Developer {i}", "company_name": "Acme",
+        "location": "Remote", "job_link": f"https://{source.lower()}.example/{i}",
+        "posted_date": "N/A", "description": "Python FastAPI SQL",
+    }
+
+
+async def _failing_fetcher(session, skills, title, location, remote):
+    raise asyncio.TimeoutError()
+
+
+async def _google_fetcher(session, skills, title, location, remote):
+    return [_job("Google", i) for i in range(3)]
+
+
+@pytest.fixture
+def one_failing_source(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_SOURCES", [("JSearch", _failing_fetcher), ("Google", _google_fetcher)])
+    monkeypatch.setattr(jobs.job_store, "ingest_in_background", lambda jobs: None)
+
+    async def skills(resume_text):
+        return ["Python", "FastAPI", "SQL"]
+    monkeypatch.setattr(jobs, "get_resume_skills", skills)
+    for cache in jobs.job_search_caches.values():
+        monkeypatch.setattr(cache, "_entries", type(cache._entries)(maxsize=8))
+
+
+def test_upload_resume_survives_one_failing_upstream(client, resume_pdf, one_failing_source):
+    r = client.post("/api/upload_resume/", files={"file": ("resume.pdf", resume_pdf, "application/pdf")})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["served_from"] == "live"
+    assert {job["source"] for job in body["jobs"]} == {"Google"}
+    assert body["total_jobs"] == 3
+
+
+def test_failed_refetch_serves_expired_entry():
+    cache = StaleWhileRevalidateCache(ttl=0, stale_ttl=0)
+
+    async def ok():
+        return ["cached"]
+
+    async def boom():
+        raise RuntimeError("upstream down")
+
+    async def run():
+        assert await cache.get_or_fetch("k", ok) == ["cached"]
+        assert await cache.get_or_fetch("k", boom) == ["cached"]
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("other", boom)
+
+    asyncio.run(run())
+    assert cache.fallback_hits == 1
+
+
+def test_job_cache_stats_include_skill_cache(client):
+    stats = client.get("/api/job_cache/stats").json()
+    assert {"JSearch", "Google", "coalescing", "skills"} <= stats.keys()
+    assert "persistent" in stats["skills"]
+
+
+def test_llm_skill_fallback_failure_keeps_local_skills(monkeypatch):
+    import skill_cache
+
+    async def groq_down(messages, **kwargs):
+        raise asyncio.TimeoutError()
+    monkeypatch.setattr(jobs, "chat_completion", groq_down)
+
+    resume = "Backend developer with Python and Docker experience."  # too few skills to be confident
+    skills = asyncio.run(jobs.get_resume_skills(resume))
+    assert set(skills) == {"Python", "Docker"}
+    assert asyncio.run(skill_cache.get_cached_skills(skill_cache.resume_key(resume))) == skills
+
+
+def test_upstream_5xx_serves_expired_results_then_empty(monkeypatch):
+    from aiohttp import web
+    import http_clients
+
+    status = {"code": 200}
+
+    async def search(request):
+        if status["code"] != 200:
+            return web.json_response({"message": "down"}, status=status["code"])
+        return web.json_response({"data": [{"job_title": "Python Developer", "employer_name": "Acme",
+                                            "job_apply_link": "https://acme.example/1"}]})
+
+    cache = StaleWhileRevalidateCache(ttl=0, stale_ttl=0)
+    monkeypatch.setitem(jobs.job_search_caches, "JSearch", cache)
+    monkeypatch.setattr(jobs.job_store, "ingest_in_background", lambda jobs: None)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/search", search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(jobs, "JSEARCH_URL", f"http://127.0.0.1:{port}/search")
+
+        search_jobs = lambda title: jobs.cached_job_search(
+            "JSearch", jobs.fetch_jsearch_jobs, ["Python"], title, None, False)
+        try:
+            fresh = await search_jobs("developer")
+            status["code"] = 503
+            expired = await search_jobs("developer")   # past the stale window, upstream 5xx
+            nothing = await search_jobs("other title")  # 5xx and nothing cached
+        finally:
+            await http_clients.close()
+            await runner.cleanup()
+        return fresh, expired, nothing
+
+    fresh, expired, nothing = asyncio.run(run())
+    assert [j["job_link"] for j in fresh] == ["https://acme.example/1"]
+    assert expired == fresh
+    assert nothing == []
+    assert cache.fallback_hits == 1
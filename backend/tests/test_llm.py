@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+import llm
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.in_flight = 0
+        self.release = asyncio.Event()
+
+    async def create(self, model, messages, **kwargs):
+        self.in_flight += 1
+        try:
+            await self.release.wait()
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=f" {messages[0]['content']} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_batch_calls_leave_slots_for_interactive_requests(monkeypatch):
+    completions = _FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(llm, "get_client", lambda: client)
+    monkeypatch.setattr(llm, "MAX_CONCURRENCY_PER_MODEL", 4)
+    monkeypatch.setattr(llm, "BATCH_CONCURRENCY_PER_MODEL", 2)
+    model = "test-batch-lane"
+
+    async def batch_call(i):
+        with llm.batch_priority():
+            return await llm.chat_completion([{"role": "user", "content": f"batch {i}"}], model=model)
+
+    async def run():
+        batch = [asyncio.create_task(batch_call(i)) for i in range(10)]
+        await asyncio.sleep(0.01)
+        assert completions.in_flight == 2  # batch capped below the model limit
+
+        interactive = asyncio.create_task(
+            llm.chat_completion([{"role": "user", "content": "ask"}], model=model)
+        )
+        await asyncio.sleep(0.01)
+        assert completions.in_flight == 3  # interactive call got a free slot at once
+
+        completions.release.set()
+        assert await interactive == "ask"
+        assert await asyncio.gather(*batch) == [f"batch {i}" for i in range(10)]
+
+    asyncio.run(run())
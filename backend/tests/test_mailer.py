@@ -0,0 +1,100 @@
+import asyncio
+import email
+import pytest
+import mailer
+from fake_upstreams import smtp_sink
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Point the mailer at a local SMTP sink; yields (inbox, start coroutine)."""
+    inbox = []
+    monkeypatch.setattr(mailer, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(mailer, "SMTP_TLS", "none")
+    monkeypatch.setattr(mailer, "EMAIL_USER", None)
+    monkeypatch.setattr(mailer, "EMAIL_FROM", "noreply@example.com")
+    monkeypatch.setattr(mailer, "MAIL_RETRY_BASE_DELAY", 0.01)
+
+    async def start():
+        server = await asyncio.start_server(smtp_sink(inbox), "127.0.0.1", 0)
+        monkeypatch.setattr(mailer, "SMTP_PORT", server.sockets[0].getsockname()[1])
+        return server
+
+    return inbox, start
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_enqueued_mail_is_delivered_over_one_connection(smtp):
+    inbox, start = smtp
+
+    async def run():
+        server = await start()
+        m = mailer.Mailer(workers=1, enabled=True)
+        for i in range(3):
+            assert m.enqueue(f"user{i}@example.com", f"Subject {i}", f"<p>Body {i}</p>")
+        await _wait_for(lambda: m.sent == 3)
+        await m.stop(timeout=1)
+        server.close()
+        return m
+
+    m = asyncio.run(run())
+    assert [rcpts for rcpts, _ in inbox] == [["user0@example.com"], ["user1@example.com"], ["user2@example.com"]]
+    assert email.message_from_bytes(inbox[0][1])["Subject"] == "Subject 0"
+    assert m.connections_opened == 1
+    assert m.stats()["failed"] == 0
+
+
+def test_worker_survives_connect_failure_and_retries(smtp):
+    inbox, start = smtp
+    calls = []
+
+    def flaky_connect():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("resolver exploded")
+        return mailer.open_connection()
+
+    async def run():
+        server = await start()
+        m = mailer.Mailer(workers=1, enabled=True, connect=flaky_connect)
+        m.enqueue("retry@example.com", "Hello", "<p>hi</p>")
+        await _wait_for(lambda: m.sent == 1)
+        m.enqueue("next@example.com", "Again", "<p>hi</p>")
+        await _wait_for(lambda: m.sent == 2)
+        await m.stop(timeout=1)
+        server.close()
+        return m
+
+    m = asyncio.run(run())
+    assert m.retried == 1
+    assert [rcpts for rcpts, _ in inbox] == [["retry@example.com"], ["next@example.com"]]
+
+
+def test_permanent_rejection_is_not_retried(smtp):
+    inbox, start = smtp
+
+    async def run():
+        server = await start()
+        m = mailer.Mailer(workers=1, enabled=True)
+        m.enqueue("bounce@example.com", "Hello", "<p>hi</p>")
+        m.enqueue("ok@example.com", "Hello", "<p>hi</p>")
+        await _wait_for(lambda: m.sent + m.failed == 2)
+        await m.stop(timeout=1)
+        server.close()
+        return m
+
+    m = asyncio.run(run())
+    assert (m.sent, m.failed, m.retried) == (1, 1, 0)
+    assert [rcpts for rcpts, _ in inbox] == [["ok@example.com"]]
+
+
+def test_disabled_mailer_drops_instead_of_queueing():
+    m = mailer.Mailer(enabled=False)
+    assert m.enqueue("a@example.com", "s", "b") is False
+    assert m.stats()["dropped"] == 1
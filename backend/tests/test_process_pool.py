@@ -0,0 +1,56 @@
+import os
+import signal
+import asyncio
+import pytest
+import pdf_text
+from process_pool import WorkerPool, WorkerCrashed
+
+
+def _crash():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _square(x):
+    return x * x
+
+
+def _break(pool: WorkerPool):
+    with pytest.raises(Exception):
+        pool.get().submit(_crash).result()
+
+
+def test_pool_recovers_after_a_worker_dies():
+    pool = WorkerPool("test", 1)
+    try:
+        _break(pool)
+        assert asyncio.run(pool.run(_square, 7)) == 49
+        assert pool.restarts == 1
+    finally:
+        pool.shutdown()
+
+
+def test_second_crash_raises_worker_crashed():
+    pool = WorkerPool("test", 1)
+    try:
+        with pytest.raises(WorkerCrashed):
+            asyncio.run(pool.run(_crash))
+        assert pool.restarts == 2
+        assert asyncio.run(pool.run(_square, 3)) == 9
+    finally:
+        pool.shutdown()
+
+
+def test_pdf_extraction_survives_killed_parse_worker(resume_pdf):
+    _break(pdf_text._pool)
+    text = asyncio.run(pdf_text.extract_pdf_text(resume_pdf + b"\n%killed-worker"))
+    assert "PROFESSIONAL SUMMARY" in text
+
+
+def test_pdf_render_survives_killed_render_worker():
+    import pdf_render
+    from fake_upstreams import RESUME_TEXT
+
+    _break(pdf_render._pool)
+    pdf = asyncio.run(pdf_render.render_resume("Test User", "t@example.com", "+91 90000 00000", RESUME_TEXT))
+    assert pdf.startswith(b"%PDF-")
+    assert pdf_render._pool.restarts == 1
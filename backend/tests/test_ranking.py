@@ -0,0 +1,46 @@
+import asyncio
+from ranking import _term_counts, _tokens, rank_jobs
+from routes import jobs
+
+
+def _job(i, title, description=""):
+    return {"job_title": title, "description": description, "job_link": f"https://jobs.example/{i}"}
+
+
+def test_term_counts_handles_phrases_and_symbols():
+    phrases = [tuple(_tokens(p)) for p in ("Machine Learning", "C++", "python")]
+    counts, lengths = _term_counts(["Python and machine learning, python; C++ too."], phrases)
+    assert counts.tolist() == [[1.0, 1.0, 2.0]]
+    assert lengths.tolist() == [7.0]
+
+
+def test_rank_jobs_prefers_title_matches():
+    ranked = rank_jobs(["Python"], [_job(0, "Java Developer", "some python"), _job(1, "Python Developer")])
+    assert [j["job_link"] for j in ranked] == ["https://jobs.example/1", "https://jobs.example/0"]
+    assert ranked[0]["match_score"] == 100.0
+    assert ranked[0]["matched_skills"] == ["Python"]
+
+
+def test_llm_rerank_is_a_permutation(monkeypatch):
+    candidates = [_job(i, t) for i, t in enumerate(
+        ["Python Developer", "Senior Python Developer", "Python Developer Intern", "Data Engineer"]
+    )]
+
+    async def fake_completion(messages, **kwargs):
+        return 'Ranking: [1, 1, 9, "0", true, 3]'
+    monkeypatch.setattr(jobs, "chat_completion", fake_completion)
+
+    ranked = asyncio.run(jobs.rank_jobs_with_llm(["Python"], candidates))
+    assert [j["job_title"] for j in ranked] == [
+        "Senior Python Developer", "Data Engineer", "Python Developer", "Python Developer Intern",
+    ]
+
+
+def test_llm_rerank_keeps_order_on_garbage(monkeypatch):
+    candidates = [_job(i, f"Job {i}") for i in range(3)]
+
+    async def fake_completion(messages, **kwargs):
+        return "I cannot rank these."
+    monkeypatch.setattr(jobs, "chat_completion", fake_completion)
+
+    assert asyncio.run(jobs.rank_jobs_with_llm(["Python"], candidates)) == candidates
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+import reset_tokens
+from passwords import hasher
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_issues_leave_one_valid_token(mongo):
+    async def issue_twice():
+        return await asyncio.gather(
+            reset_tokens.issue_token("a@example.com"),
+            reset_tokens.issue_token("a@example.com"),
+        )
+
+    tokens = _run(issue_twice())
+    assert _run(mongo["reset_tokens"].count_documents({})) == 1
+    redeemed = [_run(reset_tokens.redeem_token(t)) for t in tokens]
+    assert sorted(redeemed, key=bool) == [None, "a@example.com"]
+
+
+def _user_with_token(mongo, email="b@example.com"):
+    _run(mongo["users"].insert_one({"name": "B", "email": email, "password": "old"}))
+    return _run(reset_tokens.issue_token(email))
+
+
+def test_reset_password_updates_hash_without_logging_secrets(client, mongo, capsys):
+    token = _user_with_token(mongo)
+    r = client.post("/auth/reset-password", json={"token": token, "new_password": "s3cret-pass"})
+    assert r.status_code == 200
+    assert _run(mongo["users"].find_one({"email": "b@example.com"}))["password"] != "old"
+    out = capsys.readouterr().out
+    assert token not in out and "s3cret-pass" not in out
+
+    r = client.post("/auth/reset-password", json={"token": token, "new_password": "again"})
+    assert r.status_code == 400
+
+
+def test_reset_password_passes_hasher_503_through(client, mongo, monkeypatch):
+    token = _user_with_token(mongo)
+
+    async def busy(password):
+        raise HTTPException(status_code=503, detail="Server busy, please retry.")
+    monkeypatch.setattr(hasher, "hash", busy)
+
+    r = client.post("/auth/reset-password", json={"token": token, "new_password": "s3cret-pass"})
+    assert r.status_code == 503
+    assert _run(reset_tokens.lookup_token(token)) == "b@example.com"  # not consumed
+
+
+@pytest.mark.parametrize("body", [{}, {"token": "x"}, ["not", "an", "object"]])
+def test_reset_password_requires_token_and_password(client, body):
+    assert client.post("/auth/reset-password", json=body).status_code == 400
@@ -0,0 +1,78 @@
+import io
+import struct
+import zipfile
+from routes import resume_score
+
+
+def _zip(entries: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+def _post_zip(client, data: bytes):
+    return client.post(
+        "/api/resume_score/batch",
+        files={"resumes": ("batch.zip", data, "application/zip")},
+        data={"job_description": "Python developer"},
+    )
+
+
+def test_zip_with_too_many_entries_stops_early(client, monkeypatch):
+    monkeypatch.setattr(resume_score, "SCORE_BATCH_MAX_SIZE", 3)
+    reads = []
+    original = resume_score._BatchReader._read_entry
+    monkeypatch.setattr(
+        resume_score._BatchReader, "_read_entry",
+        lambda self, archive, info, base: reads.append(base) or original(self, archive, info, base),
+    )
+    r = _post_zip(client, _zip({f"r{i}.pdf": b"%PDF-1.4" for i in range(50)}))
+    assert r.status_code == 413
+    assert len(reads) == 3
+
+
+def test_zip_entry_over_upload_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(resume_score, "MAX_UPLOAD_BYTES", 1024)
+    r = _post_zip(client, _zip({"big.pdf": b"0" * 1024 * 1024}))
+    assert r.status_code == 413
+    assert "big.pdf" in r.json()["detail"]
+
+
+def test_zip_total_decompressed_budget(client, monkeypatch):
+    monkeypatch.setattr(resume_score, "SCORE_BATCH_MAX_TOTAL_BYTES", 10_000)
+    r = _post_zip(client, _zip({f"r{i}.pdf": b"0" * 4000 for i in range(5)}))
+    assert r.status_code == 413
+    assert "MB of PDFs" in r.json()["detail"]
+
+
+def test_forged_file_size_is_rejected_as_bad_zip(client):
+    data = bytearray(_zip({"bomb.pdf": b"%PDF-1.4" + b"0" * 1024 * 1024}))
+    central = data.index(b"PK\x01\x02")
+    struct.pack_into("<I", data, central + 24, 10)  # uncompressed size claims 10 bytes
+    assert zipfile.ZipFile(io.BytesIO(bytes(data))).infolist()[0].file_size == 10
+
+    r = _post_zip(client, bytes(data))
+    assert r.status_code == 400
+    assert "Invalid ZIP upload" in r.json()["detail"]
+
+
+def test_corrupt_zip_is_400(client):
+    r = _post_zip(client, b"PK\x03\x04 not really a zip")
+    assert r.status_code == 400
+
+
+def test_llm_output_cannot_overwrite_batch_bookkeeping(monkeypatch):
+    import asyncio
+
+    async def text(data, max_pages=None):
+        return "Python developer"
+
+    async def score(resume_text, job_context):
+        return {"score": 80, "status": "error", "index": 99, "filename": "evil.pdf"}, ""
+
+    monkeypatch.setattr(resume_score, "extract_pdf_text", text)
+    monkeypatch.setattr(resume_score, "score_resume_text", score)
+    result = asyncio.run(resume_score._score_one(3, "a.pdf", b"%PDF", "JD", asyncio.Semaphore(1)))
+    assert (result["index"], result["filename"], result["status"], result["score"]) == (3, "a.pdf", "ok", 80)
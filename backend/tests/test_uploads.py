@@ -0,0 +1,30 @@
+def _pdf_file(field, data):
+    return {field: ("resume.pdf", data, "application/pdf")}
+
+
+def test_truncated_pdf_is_rejected_with_400(client, resume_pdf):
+    truncated = resume_pdf[: len(resume_pdf) // 2]
+
+    r = client.post("/api/resume_score", files=_pdf_file("resume", truncated), data={"mode": "fast"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Could not read PDF"
+
+    r = client.post("/api/upload_resume/", files=_pdf_file("file", truncated))
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Could not read PDF"
+    assert "/tmp" not in r.text
+
+
+def test_valid_pdf_is_scored(client, resume_pdf):
+    r = client.post("/api/resume_score", files=_pdf_file("resume", resume_pdf), data={"mode": "fast"})
+    assert r.status_code == 200
+    assert 0 <= r.json()["score"] <= 100
+
+
+def test_pdf_cache_stats_count_repeat_uploads(client, resume_pdf):
+    before = client.get("/api/pdf_cache/stats").json()
+    for _ in range(2):
+        client.post("/api/resume_score", files=_pdf_file("resume", resume_pdf), data={"mode": "fast"})
+    after = client.get("/api/pdf_cache/stats").json()
+    assert after["hits"] >= before["hits"] + 1
+    assert {"size", "maxsize", "evictions", "disk_tier"} <= after.keys()
@@ -0,0 +1,29 @@
+import asyncio
+import youtube_cache
+from youtube_cache import QuotaBudget, YouTubeCache
+
+VIDEOS = [{"title": "Python in 1 hour", "url": "https://youtube.example/watch?v=1"}]
+
+
+def test_persisted_searches_and_quota_are_read_back(mongo, monkeypatch):
+    monkeypatch.setattr(youtube_cache, "YOUTUBE_CACHE_PERSIST", True)
+    monkeypatch.setattr(youtube_cache, "_offline_until", 0.0)
+
+    async def fetch(query):
+        return VIDEOS
+
+    async def run():
+        first = YouTubeCache(QuotaBudget(daily_limit=1000, reserve=0))
+        assert (await first.search("Python tutorial", fetch))["source"] == "live"
+
+        # A fresh worker: single lookup from Mongo, then a full warm-up
+        second = YouTubeCache(QuotaBudget(daily_limit=1000, reserve=0))
+        loaded = await second.search("python", None)
+        warmed = await YouTubeCache(QuotaBudget()).warm()
+        used = await QuotaBudget().used()
+        return loaded, warmed, used
+
+    loaded, warmed, used = asyncio.run(run())
+    assert loaded == {"videos": VIDEOS, "source": "cache"}
+    assert warmed == 1
+    assert used == youtube_cache.YOUTUBE_SEARCH_COST
@@ -0,0 +1,87 @@
+import os
+import hashlib
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from fastapi import UploadFile, HTTPException
+from config import settings
+from pdf_text import extract_pdf_file_text, PageLimitExceeded, UnreadablePdf
+
+# =====================================================
+# 🔹 Bounded, streaming resume upload ingestion
+# =====================================================
+# Uploads are copied to a private temp file in fixed-size chunks while
+# being hashed, so a request never holds the whole PDF in memory. Size
+# is enforced as soon as it is known (declared size, then per chunk),
+# the page limit is enforced before any text is extracted, and the
+# temp file is always removed when the request is done with it.
+
+MAX_UPLOAD_BYTES = settings.max_upload_bytes
+MAX_PDF_PAGES = settings.max_pdf_pages
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class IngestedPdf:
+    path: str
+    sha256: str
+    size: int
+    filename: str
+
+    async def text(self, max_pages: int = MAX_PDF_PAGES) -> str:
+        """Extracted text (cached by hash); raises 413 if over the page limit, 400 if unparseable."""
+        try:
+            return await extract_pdf_file_text(self.path, self.sha256, max_pages)
+        except PageLimitExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except UnreadablePdf as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (max {max_bytes / (1024 * 1024):.1f} MB).")
+
+
+async def read_limited(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> bytes:
+    """Read a whole upload in chunks, rejecting it as soon as it exceeds max_bytes."""
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+    chunks, size = [], 0
+    while chunk := await upload.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@asynccontextmanager
+async def ingest_pdf(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES):
+    """
+    async with ingest_pdf(file) as pdf: text = await pdf.text()
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        hasher = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                if size == 0 and b"%PDF-" not in chunk[:1024]:
+                    raise HTTPException(status_code=400, detail="Uploaded file is not a PDF.")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                hasher.update(chunk)
+                out.write(chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+        yield IngestedPdf(path=path, sha256=hasher.hexdigest(), size=size, filename=upload.filename or "")
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,386 @@
+import time
+import asyncio
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pymongo import ReturnDocument, DESCENDING
+from config import settings
+from cache import TTLCache
+from singleflight import SingleFlight
+from answer_cache import normalize_query
+import metrics
+
+# =====================================================
+# 🔹 Quota-aware YouTube search cache
+# =====================================================
+# A YouTube Data API search costs 100 units of a daily quota (10,000 by
+# default) that resets at midnight Pacific time. Results are cached for
+# a long time under a normalized query key, in memory and in MongoDB
+# (collection `youtube_cache`, expired by a TTL index), so they survive
+# restarts and are shared by workers. Units spent today are counted in
+# `youtube_quota`, one document per quota day, with an atomic $inc.
+#
+#   entry younger than FRESH_TTL    served as is
+#   older entry (up to TTL)         served; refreshed in the background
+#                                   only while the budget is healthy
+#   miss, budget healthy            live search
+#   miss, under QUOTA_RESERVE left  closest cached query if one shares
+#                                   enough words, else live search
+#   miss, budget spent              closest cached query, else nothing
+YOUTUBE_CACHE_FRESH_TTL = settings.youtube_cache_fresh_ttl
+YOUTUBE_CACHE_TTL = settings.youtube_cache_ttl
+YOUTUBE_CACHE_SIZE = settings.youtube_cache_size
+YOUTUBE_CACHE_PERSIST = settings.youtube_cache_persist
+YOUTUBE_DAILY_QUOTA = settings.youtube_daily_quota
+YOUTUBE_SEARCH_COST = settings.youtube_search_cost
+YOUTUBE_QUOTA_RESERVE = settings.youtube_quota_reserve
+YOUTUBE_QUOTA_TZ = settings.youtube_quota_tz
+YOUTUBE_RELATED_MIN_OVERLAP = settings.youtube_related_min_overlap
+
+RELATED_SCAN_LIMIT = 200
+STORE_RETRY_AFTER = 60  # seconds to stay memory-only after a MongoDB error
+
+# Words that do not change which videos a search should return
+_FILLER_WORDS = {
+    "a", "an", "the", "and", "for", "in", "of", "on", "to", "with", "how",
+    "learn", "learning", "video", "videos", "tutorial", "tutorials", "youtube",
+}
+
+_offline_until = 0.0
+
+
+class QuotaExceeded(Exception):
+    """YouTube answered that today's quota is used up."""
+
+
+def query_key(query: str) -> str:
+    """Order-, case- and filler-insensitive key: "Python tutorial for Beginners" -> "beginners python"."""
+    words = normalize_query(query).split()
+    core = {w for w in words if w not in _FILLER_WORDS} or set(words)
+    return " ".join(sorted(core))
+
+
+def _overlap(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _epoch(value: datetime) -> float:
+    # pymongo returns naive UTC datetimes unless the client is tz_aware
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _quota_zone():
+    try:
+        return ZoneInfo(YOUTUBE_QUOTA_TZ)
+    except ZoneInfoNotFoundError:  # no tz database (e.g. Windows without tzdata)
+        return timezone(timedelta(hours=-8))
+
+
+# ✅ MongoDB is optional: after an error, stay memory-only for a while
+def _store_ready() -> bool:
+    return YOUTUBE_CACHE_PERSIST and time.monotonic() >= _offline_until
+
+
+def _store_failed(action: str, error: Exception):
+    global _offline_until
+    _offline_until = time.monotonic() + STORE_RETRY_AFTER
+    print(f"⚠️ YouTube {action} failed, memory only for {STORE_RETRY_AFTER}s: {error}")
+
+
+def _collection(name: str):
+    from database import db
+    return db[name]
+
+
+# =====================================================
+# 🔹 Daily quota budget
+# =====================================================
+class QuotaBudget:
+    """Quota units spent today, shared across workers through MongoDB."""
+
+    def __init__(self, daily_limit: int = YOUTUBE_DAILY_QUOTA, reserve: int = YOUTUBE_QUOTA_RESERVE):
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        self.zone = _quota_zone()
+        self._day = None
+        self._used = 0
+        self.spent = 0    # units spent by this process
+        self.denied = 0   # searches refused for lack of budget
+
+    def _roll(self) -> str:
+        day = datetime.now(self.zone).date().isoformat()
+        if day != self._day:
+            self._day, self._used = day, 0
+        return day
+
+    async def used(self) -> int:
+        day = self._roll()
+        if _store_ready():
+            try:
+                doc = await _collection("youtube_quota").find_one({"_id": day}, {"_id": 0, "used": 1})
+                self._used = max(self._used, doc["used"] if doc else 0)
+            except Exception as e:
+                _store_failed("quota read", e)
+        return self._used
+
+    async def remaining(self) -> int:
+        return max(self.daily_limit - await self.used(), 0)
+
+    async def try_spend(self, units: int) -> bool:
+        """Claim units for one API call; False (nothing claimed) if that would exceed the budget."""
+        day = self._roll()
+        if self._used + units > self.daily_limit:
+            self.denied += 1
+            return False
+        if _store_ready():
+            try:
+                quota = _collection("youtube_quota")
+                doc = await quota.find_one_and_update(
+                    {"_id": day},
+                    {"$inc": {"used": units}, "$setOnInsert": {"created_at": datetime.now(timezone.utc)}},
+                    projection={"_id": 0, "used": 1},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                if doc["used"] > self.daily_limit:
+                    # Another worker got there first; give the units back
+                    await quota.update_one({"_id": day}, {"$inc": {"used": -units}})
+                    self._used = doc["used"] - units
+                    self.denied += 1
+                    return False
+                self._used = doc["used"]
+            except Exception as e:
+                _store_failed("quota update", e)
+                self._used += units
+        else:
+            self._used += units
+        self.spent += units
+        metrics.youtube_quota_units.inc(units)
+        return True
+
+    async def exhaust(self):
+        """YouTube reported the quota as used up: stop spending for the rest of the day."""
+        day = self._roll()
+        self._used = self.daily_limit
+        if _store_ready():
+            try:
+                await _collection("youtube_quota").update_one(
+                    {"_id": day}, {"$max": {"used": self.daily_limit}}, upsert=True
+                )
+            except Exception as e:
+                _store_failed("quota update", e)
+
+    def stats(self) -> dict:
+        self._roll()
+        return {
+            "day": self._day,
+            "daily_limit": self.daily_limit,
+            "used": self._used,
+            "remaining": max(self.daily_limit - self._used, 0),
+            "reserve": self.reserve,
+            "spent_by_worker": self.spent,
+            "denied": self.denied,
+        }
+
+
+# =====================================================
+# 🔹 Search cache
+# =====================================================
+class YouTubeCache:
+    def __init__(self, quota: QuotaBudget, maxsize: int = YOUTUBE_CACHE_SIZE):
+        self.quota = quota
+        self._memory = TTLCache(maxsize=maxsize, ttl=YOUTUBE_CACHE_TTL)
+        self._flights = SingleFlight()
+        self._refreshing = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.related_hits = 0
+        self.live_searches = 0
+        self.refreshes = 0
+        self.unavailable = 0
+
+    async def search(self, query: str, fetch) -> dict:
+        """
+        Videos for `query` and where they came from: "cache", "stale",
+        "related", "live" or "unavailable". `await fetch(query)` runs the
+        API search; pass None when live search is disabled.
+        """
+        key = query_key(query)
+        if not key:
+            return {"videos": [], "source": "unavailable"}
+
+        entry = self._memory.get(key) or await self._load(key)
+        if entry is not None:
+            if time.time() - entry["fetched_at"] < YOUTUBE_CACHE_FRESH_TTL:
+                self.hits += 1
+                return {"videos": entry["videos"], "source": "cache"}
+            self.stale_hits += 1
+            if fetch is not None:
+                self._refresh_in_background(key, query, fetch)
+            return {"videos": entry["videos"], "source": "stale"}
+
+        self.misses += 1
+        if fetch is None or await self.quota.remaining() < self.quota.reserve:
+            related = await self._related(key)
+            if related is not None:
+                self.related_hits += 1
+                return {"videos": related["videos"], "source": "related", "related_query": related["query"]}
+
+        videos = await self._fetch(key, query, fetch) if fetch is not None else None
+        if videos is None:
+            self.unavailable += 1
+            return {"videos": [], "source": "unavailable"}
+        return {"videos": videos, "source": "live"}
+
+    # -------- live searches --------
+    async def _fetch(self, key: str, query: str, fetch):
+        """Live search (concurrent misses share one call); None when the budget is spent."""
+        return await self._flights.do(key, lambda: self._fetch_and_store(key, query, fetch))
+
+    async def _fetch_and_store(self, key: str, query: str, fetch):
+        if not await self.quota.try_spend(YOUTUBE_SEARCH_COST):
+            return None
+        try:
+            videos = await fetch(query)
+        except QuotaExceeded:
+            await self.quota.exhaust()
+            return None
+        self.live_searches += 1
+        if videos:
+            await self._store(key, query, videos)
+        return videos
+
+    def _refresh_in_background(self, key: str, query: str, fetch):
+        if key not in self._refreshing:
+            self._refreshing[key] = asyncio.create_task(self._refresh(key, query, fetch))
+
+    async def _refresh(self, key: str, query: str, fetch):
+        try:
+            if await self.quota.remaining() - YOUTUBE_SEARCH_COST >= self.quota.reserve:
+                if await self._fetch(key, query, fetch) is not None:
+                    self.refreshes += 1
+        except Exception as e:
+            print(f"⚠️ Background YouTube refresh failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    # -------- storage --------
+    def _remember(self, key: str, query: str, videos: list, fetched_at: float):
+        ttl = YOUTUBE_CACHE_TTL - (time.time() - fetched_at)
+        if ttl > 0:
+            self._memory.set(key, {"query": query, "videos": videos, "fetched_at": fetched_at}, ttl=ttl)
+
+    async def _store(self, key: str, query: str, videos: list):
+        fetched_at = time.time()
+        self._remember(key, query, videos, fetched_at)
+        if not _store_ready():
+            return
+        try:
+            await _collection("youtube_cache").replace_one(
+                {"_id": key},
+                {
+                    "query": query,
+                    "words": key.split(),
+                    "videos": videos,
+                    "fetched_at": datetime.fromtimestamp(fetched_at, timezone.utc),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            _store_failed("cache write", e)
+
+    async def _load(self, key: str):
+        if not _store_ready():
+            return None
+        try:
+            doc = await _collection("youtube_cache").find_one(
+                {"_id": key}, {"_id": 0, "query": 1, "videos": 1, "fetched_at": 1}
+            )
+        except Exception as e:
+            _store_failed("cache read", e)
+            return None
+        if doc is None:
+            return None
+        fetched_at = _epoch(doc["fetched_at"])
+        if time.time() - fetched_at >= YOUTUBE_CACHE_TTL:
+            return None  # the TTL sweep has not caught up yet
+        self._remember(key, doc["query"], doc["videos"], fetched_at)
+        return {"query": doc["query"], "videos": doc["videos"], "fetched_at": fetched_at}
+
+    async def _related(self, key: str):
+        """Cached entry whose key shares the most words with `key` (at least the minimum overlap)."""
+        words = set(key.split())
+        best, best_score = None, 0.0
+        for other, entry in self._memory.items():
+            score = _overlap(words, set(other.split()))
+            if score > best_score:
+                best, best_score = entry, score
+
+        if best_score < YOUTUBE_RELATED_MIN_OVERLAP and _store_ready():
+            try:
+                cursor = _collection("youtube_cache").find(
+                    {"words": {"$in": list(words)}}, {"_id": 0, "query": 1, "words": 1, "videos": 1}
+                ).limit(RELATED_SCAN_LIMIT)
+                async for doc in cursor:
+                    score = _overlap(words, set(doc["words"]))
+                    if score > best_score:
+                        best, best_score = doc, score
+            except Exception as e:
+                _store_failed("cache read", e)
+
+        return best if best_score >= YOUTUBE_RELATED_MIN_OVERLAP else None
+
+    async def warm(self) -> int:
+        """Load the most recent persisted searches into memory (call at startup)."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=YOUTUBE_CACHE_TTL)
+        docs = await _collection("youtube_cache").find(
+            {"fetched_at": {"$gt": cutoff}}, {"query": 1, "videos": 1, "fetched_at": 1}  # _id is the cache key
+        ).sort("fetched_at", DESCENDING).limit(self._memory.maxsize).to_list()
+        for doc in reversed(docs):  # oldest first, so the newest end up most recently used
+            self._remember(doc["_id"], doc["query"], doc["videos"], _epoch(doc["fetched_at"]))
+        return len(docs)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        local = self.hits + self.stale_hits + self.related_hits
+        return {
+            "size": len(self._memory),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "related_hits": self.related_hits,
+            "misses": self.misses,
+            "live_searches": self.live_searches,
+            "refreshes": self.refreshes,
+            "unavailable": self.unavailable,
+            "local_rate": round(local / lookups, 4) if lookups else 0.0,
+            "persistent": YOUTUBE_CACHE_PERSIST,
+        }
+
+
+quota = QuotaBudget()
+_cache = YouTubeCache(quota)
+metrics.register_cache("youtube", _cache)
+
+
+async def init():
+    """Ensure indexes and warm memory from MongoDB; never blocks startup on failure."""
+    if not YOUTUBE_CACHE_PERSIST:
+        return
+    try:
+        cache = _collection("youtube_cache")
+        await cache.create_index("fetched_at", expireAfterSeconds=YOUTUBE_CACHE_TTL)
+        await cache.create_index("words")
+        await _collection("youtube_quota").create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
+        print(f"✅ Loaded {await _cache.warm()} cached YouTube searches")
+    except Exception as e:
+        print(f"⚠️ Could not prepare the YouTube cache: {e}")
+
+
+async def search(query: str, fetch) -> dict:
+    return await _cache.search(query, fetch)
+
+
+def get_stats() -> dict:
+    return {**_cache.stats(), "quota": quota.stats()}
@@ -1,22 +1,46 @@
 import React, { useEffect, useState } from "react";
 
+const API_URL = "http://localhost:8000/api/admin/users";
+const PAGE_SIZE = 50;
+
 export default function AdminDashboard() {
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [search, setSearch] = useState("");
+  const [sort, setSort] = useState("signup_date");
+  const [order, setOrder] = useState("desc");
+
+  function buildQuery(extra = {}) {
+    const params = new URLSearchParams({ sort, order, ...extra });
+    if (search.trim()) params.set("search", search.trim());
+    return params.toString();
+  }
 
-  // ✅ Fetch all users when admin logs in
+  // ✅ Fetch one page of users (cursor = null starts from the top)
+  async function fetchUsers(cursor = null) {
+    setLoading(true);
+    try {
+      const extra = { limit: PAGE_SIZE };
+      if (cursor) extra.cursor = cursor;
+      const res = await fetch(`${API_URL}?${buildQuery(extra)}`);
+      const data = await res.json();
+      setUsers((prev) => (cursor ? [...prev, ...(data.users || [])] : data.users || []));
+      setNextCursor(data.next_cursor || null);
+      if (data.total !== undefined) setTotalUsers(data.total);
+    } catch (err) {
+      console.error("Error fetching users:", err);
+    } finally {
+      setLoading(false);
+    }
+  }
+
+  // ✅ Reload from the first page whenever search or sort changes
   useEffect(() => {
-    fetch("http://localhost:8000/api/admin/users")
-      .then((res) => res.json())
-      .then((data) => {
-        setUsers(data.users || []);
-        setLoading(false);
-      })
-      .catch((err) => {
-        console.error("Error fetching users:", err);
-        setLoading(false);
-      });
-  }, []);
+    const timer = setTimeout(() => fetchUsers(), 300);
+    return () => clearTimeout(timer);
+  }, [search, sort, order]);
 
   // ✅ Delete a user
   async function handleDeleteUser(userId) {
@@ -26,7 +50,8 @@ export default function AdminDashboard() {
         method: "DELETE",
       });
       if (res.ok) {
-        setUsers(users.filter((u) => u._id !== userId));
+        setUsers(users.filter((u) => u.id !== userId));
+        setTotalUsers((n) => Math.max(n - 1, 0));
         alert("✅ User deleted successfully!");
       } else {
         alert("❌ Failed to delete user.");
@@ -48,7 +73,7 @@ export default function AdminDashboard() {
       <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-10">
         <div className="bg-white rounded-2xl shadow-lg p-6 text-center">
           <h2 className="text-xl font-semibold mb-2">Total Users</h2>
-          <p className="text-2xl font-bold text-indigo-600">{users.length}</p>
+          <p className="text-2xl font-bold text-indigo-600">{totalUsers}</p>
         </div>
 
         <div className="bg-white rounded-2xl shadow-lg p-6 text-center">
@@ -65,7 +90,40 @@ export default function AdminDashboard() {
       {/* User Management */}
       <h2 className="text-2xl font-bold mb-4 text-gray-700">User Management</h2>
 
-      {loading ? (
+      <div className="flex flex-wrap gap-3 mb-4">
+        <input
+          type="text"
+          value={search}
+          onChange={(e) => setSearch(e.target.value)}
+          placeholder="Search by name or email"
+          className="border rounded-lg px-3 py-2 flex-1 min-w-[200px]"
+        />
+        <select
+          value={sort}
+          onChange={(e) => setSort(e.target.value)}
+          className="border rounded-lg px-3 py-2"
+        >
+          <option value="signup_date">Signup Date</option>
+          <option value="name">Name</option>
+          <option value="email">Email</option>
+        </select>
+        <select
+          value={order}
+          onChange={(e) => setOrder(e.target.value)}
+          className="border rounded-lg px-3 py-2"
+        >
+          <option value="desc">Descending</option>
+          <option value="asc">Ascending</option>
+        </select>
+        <a
+          href={`${API_URL}/export?${buildQuery()}`}
+          className="bg-indigo-500 hover:bg-indigo-600 text-white px-4 py-2 rounded-lg"
+        >
+          Export
+        </a>
+      </div>
+
+      {loading && users.length === 0 ? (
         <p className="text-center">⏳ Loading users...</p>
       ) : users.length === 0 ? (
         <p className="text-center text-gray-500">No users found.</p>
@@ -82,13 +140,13 @@ export default function AdminDashboard() {
             </thead>
             <tbody>
               {users.map((u) => (
-                <tr key={u._id} className="hover:bg-gray-50">
+                <tr key={u.id} className="hover:bg-gray-50">
                   <td className="p-3 border-b">{u.name}</td>
                   <td className="p-3 border-b">{u.email}</td>
                   <td className="p-3 border-b">{u.signup_date || "—"}</td>
                   <td className="p-3 border-b">
                     <button
-                      onClick={() => handleDeleteUser(u._id)}
+                      onClick={() => handleDeleteUser(u.id)}
                       className="bg-red-500 hover:bg-red-600 text-white px-3 py-1 rounded-lg"
                     >
                       Delete
@@ -98,6 +156,17 @@ export default function AdminDashboard() {
               ))}
             </tbody>
           </table>
+          {nextCursor && (
+            <div className="text-center mt-4">
+              <button
+                onClick={() => fetchUsers(nextCursor)}
+                disabled={loading}
+                className="bg-indigo-500 hover:bg-indigo-600 text-white px-4 py-2 rounded-lg disabled:opacity-50"
+              >
+                {loading ? "⏳ Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { motion } from "framer-motion";
 import { FiSearch, FiBookOpen, FiPlayCircle } from "react-icons/fi";
 
@@ -8,6 +8,8 @@ export default function AiTutor() {
   const [courses, setCourses] = useState([]);
   const [recommended, setRecommended] = useState([]);
   const [loading, setLoading] = useState(false);
+  const [resultNote, setResultNote] = useState("");
+  const lastSearch = useRef("");
 
   const popularTopics = [
     "Python",
@@ -35,18 +37,29 @@ export default function AiTutor() {
     fetchRecommended();
   }, []);
 
-  const handleSearch = async () => {
-    if (!query.trim()) return;
+  const handleSearch = async (term = query) => {
+    const q = term.trim();
+    // Each uncached search spends YouTube API quota, so don't repeat the last one
+    if (!q || q.toLowerCase() === lastSearch.current) return;
+    lastSearch.current = q.toLowerCase();
     setLoading(true);
     try {
-      const videoRes = await fetch(`http://localhost:8000/api/youtube_videos?q=${query}`);
+      const videoRes = await fetch(`http://localhost:8000/api/youtube_videos?q=${encodeURIComponent(q)}`);
       const videoData = await videoRes.json();
       setVideos(videoData.videos || []);
+      if (videoData.source === "related") {
+        setResultNote(`Showing saved results for “${videoData.related_query}”`);
+      } else if (videoData.source === "recommended") {
+        setResultNote("Daily search limit reached, showing recommended videos");
+      } else {
+        setResultNote("");
+      }
 
-      const courseRes = await fetch(`http://localhost:8000/api/recommended_courses?q=${query}`);
+      const courseRes = await fetch(`http://localhost:8000/api/recommended_courses?q=${encodeURIComponent(q)}`);
       const courseData = await courseRes.json();
       setCourses(courseData.courses || []);
     } catch (error) {
+      lastSearch.current = "";
       console.error("Error fetching data:", error);
     } finally {
       setLoading(false);
@@ -82,7 +95,7 @@ export default function AiTutor() {
             onKeyDown={(e) => e.key === "Enter" && handleSearch()}
           />
           <button
-            onClick={handleSearch}
+            onClick={() => handleSearch()}
             className="bg-blue-600 text-white px-5 py-3 flex items-center justify-center hover:bg-blue-700 transition-all"
           >
             <FiSearch size={20} />
@@ -99,7 +112,7 @@ export default function AiTutor() {
             whileHover={{ scale: 1.05 }}
             onClick={() => {
               setQuery(topic);
-              handleSearch();
+              handleSearch(topic);
             }}
           >
             {topic}
@@ -125,6 +138,7 @@ export default function AiTutor() {
           <h2 className="text-2xl font-semibold text-gray-800 mb-5 flex items-center justify-center gap-2">
             <FiPlayCircle /> Search Results for “{query}”
           </h2>
+          {resultNote && <p className="text-center text-sm text-gray-600 -mt-3 mb-5">{resultNote}</p>}
           <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6 mb-12">
             {videos.map((video) => (
               <motion.div